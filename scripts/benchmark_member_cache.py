@@ -0,0 +1,175 @@
+"""Measure the memory used by the member cache of a large guild, per cache preset.
+
+The same gateway traffic of a synthetic guild is fed to a client configured
+with each of the snapcogs.cache presets, through the client's own event
+parsers, which decide what the cache keeps. Like Discord, the traffic is
+filtered by the preset's intents: the online members and their presences are
+only sent in GUILD_CREATE with the presences intent, the member chunks and
+joins with the members intent, and the presence updates with the presences
+intent. The members are only chunked when the preset chunks at startup.
+
+Usage: python scripts/benchmark_member_cache.py [--members COUNT]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import tracemalloc
+from typing import Any
+
+import discord
+
+from snapcogs.cache import CACHE_PRESETS
+
+GUILD_ID = "1"
+# the size of the chunks sent by Discord
+CHUNK_SIZE = 1000
+# about a quarter of the members are online
+ONLINE_RATIO = 4
+# members who join while the bot runs
+JOIN_RATIO = 100
+
+
+def member_payload(i: int) -> dict[str, Any]:
+    return {
+        "user": {
+            "id": str(10**6 + i),
+            "username": f"user{i}",
+            "discriminator": "0",
+            "avatar": None,
+            "global_name": f"User {i}",
+        },
+        "roles": [],
+        "joined_at": "2024-01-01T00:00:00+00:00",
+        "deaf": False,
+        "mute": False,
+        "nick": None,
+        "flags": 0,
+    }
+
+
+def presence_payload(i: int, status: str = "online") -> dict[str, Any]:
+    return {
+        "user": {"id": str(10**6 + i)},
+        "guild_id": GUILD_ID,
+        "status": status,
+        "activities": [],
+        "client_status": {"desktop": status},
+    }
+
+
+def guild_payload(members: int, intents: discord.Intents) -> dict[str, Any]:
+    """Return the GUILD_CREATE payload of a large guild."""
+
+    online = range(0, members, ONLINE_RATIO) if intents.presences else range(0)
+    return {
+        "id": GUILD_ID,
+        "name": "Benchmark",
+        "icon": None,
+        "owner_id": "2",
+        "roles": [
+            {
+                "id": GUILD_ID,
+                "name": "@everyone",
+                "permissions": "0",
+                "position": 0,
+                "color": 0,
+                "hoist": False,
+                "managed": False,
+                "mentionable": False,
+            }
+        ],
+        "emojis": [],
+        "features": [],
+        "member_count": members,
+        "large": True,
+        "channels": [],
+        "threads": [],
+        "members": [member_payload(i) for i in online],
+        "presences": [presence_payload(i) for i in online],
+    }
+
+
+async def feed_events(
+    client: discord.Client, preset_chunks: bool, members: int
+) -> discord.Guild:
+    """Feed the guild's gateway traffic to the client, as filtered by its
+    intents, and return the guild.
+    """
+
+    state = client._connection
+    intents = client.intents
+    guild = state._add_guild_from_data(guild_payload(members, intents))  # type: ignore[arg-type]
+
+    if preset_chunks and intents.members:
+        # request the chunks without a websocket, and answer them
+        async def chunker(*_: Any, **__: Any) -> None:  # noqa: ANN401
+            pass
+
+        state.chunker = chunker  # type: ignore[assignment]
+        future = await state.chunk_guild(guild, wait=False)
+        nonce = state._chunk_requests[guild.id].nonce
+        chunk_count = -(-members // CHUNK_SIZE)
+        for index, start in enumerate(range(0, members, CHUNK_SIZE)):
+            state.parse_guild_members_chunk(
+                {  # type: ignore[arg-type]
+                    "guild_id": GUILD_ID,
+                    "members": [
+                        member_payload(i)
+                        for i in range(start, min(start + CHUNK_SIZE, members))
+                    ],
+                    "chunk_index": index,
+                    "chunk_count": chunk_count,
+                    "nonce": nonce,
+                }
+            )
+        await future
+
+    if intents.members:
+        for i in range(members, members + members // JOIN_RATIO):
+            state.parse_guild_member_add({**member_payload(i), "guild_id": GUILD_ID})  # type: ignore[arg-type]
+
+    if intents.presences:
+        for i in range(0, members, ONLINE_RATIO):
+            state.parse_presence_update(presence_payload(i, "idle"))  # type: ignore[arg-type]
+
+    return guild
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--members",
+        type=int,
+        default=100_000,
+        help="number of members of the guild (default: 100000)",
+    )
+    args = parser.parse_args()
+
+    for name, preset in CACHE_PRESETS.items():
+        intents = preset.intents(discord.Intents.default())
+        client = discord.Client(
+            intents=intents,
+            member_cache_flags=preset.member_cache_flags(intents),
+            chunk_guilds_at_startup=preset.chunk_guilds_at_startup,
+        )
+        # done when logging in, gives the client its loop
+        await client._async_setup_hook()
+
+        gc.collect()
+        tracemalloc.start()
+        guild = await feed_events(client, preset.chunk_guilds_at_startup, args.members)
+        gc.collect()
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            f"{name:>8}: {len(guild._members):>7} members cached, "
+            f"{memory / 2**20:6.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""Check that importing the cogs stays cheap, with ``python -X importtime``.
+
+Each cog module is imported in a fresh interpreter, after the dependencies
+shared by all cogs, and fails the check when it imports one of its heavy
+optional dependencies or takes longer than the budget.
+
+Usage: python scripts/check_import_time.py [--budget MILLISECONDS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+
+# imported by every cog, so not counted in their budget
+SHARED = ["discord", "discord.ext.commands", "sqlalchemy", "snapcogs.bot"]
+
+# cog module -> optional dependencies it must only import on first use
+COGS = {
+    "snapcogs.Fun.fun": ["PIL"],
+    "snapcogs.Horoscope.horoscope": ["bs4"],
+    "snapcogs.Measurements.measurements": ["pint"],
+    "snapcogs.Timestamps.timestamps": ["dateutil", "pytz"],
+}
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Return the cumulative import time of each module imported by the
+    module, in microseconds.
+    """
+
+    code = f"import {', '.join(SHARED)}; import {module}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    shared_done = False
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        name = name.strip()
+        if shared_done:
+            times[name] = int(cumulative)
+        elif name == SHARED[-1]:
+            shared_done = True
+
+    return times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=100.0,
+        help="maximum import time of each cog, in milliseconds (default: 100)",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for module, heavy in COGS.items():
+        times = import_times(module)
+        total = times.get(module, 0) / 1000
+        imported = sorted(name for name in times if name.split(".")[0] in heavy)
+        status = "ok"
+        if imported:
+            status = f"imports {', '.join(imported)}"
+            failed = True
+        elif total > args.budget:
+            status = f"over the {args.budget:.0f}ms budget"
+            failed = True
+
+        print(f"{module}: {total:.1f}ms, {status}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,23 +5,41 @@ import datetime
 import itertools
 import logging
 import random
+from collections import defaultdict
 from enum import Enum
+from functools import cache
 from pathlib import Path
 from typing import TYPE_CHECKING
+from zoneinfo import available_timezones
 
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 from discord.utils import format_dt
-from sqlalchemy import delete, select
+from sqlalchemy import and_, delete, func, or_, select, true, tuple_
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.exc import IntegrityError
 
+from ..cache import CacheNeeds
 from ..utils import relative_dt
-from ..utils.views import confirm_prompt
-from .models import Birthday
+from ..utils.views import confirm_prompt, paginate
+from .calendar import BirthdayCalendar
+from .models import (
+    BIRTHDAY_MONTH_DAY,
+    AnnouncementRun,
+    Birthday,
+    BirthdayRole,
+    GuildConfig,
+    RoleExpiry,
+)
+from .reactions import ReactionDispatcher
+from .scheduler import BirthdayScheduler, Schedule
 
 if TYPE_CHECKING:
-    from asyncio import Task
+    from collections.abc import Coroutine
+    from typing import Any
+
+    from sqlalchemy import ColumnElement, ScalarSelect
 
     from ..bot import Bot
 
@@ -31,6 +49,28 @@ SQL = Path(__file__).parent / "sql"
 
 EMBED_COLOR = 0xFFD700
 
+# number of days with birthdays per page of the calendar
+CALENDAR_PAGE_SIZE = 15
+# number of names per page of the calendar, to stay under the 4096 characters
+# of an embed description with 32 characters names
+CALENDAR_PAGE_NAMES = 100
+
+# number of rows per DELETE statement when deleting birthdays in bulk
+DELETE_BATCH_SIZE = 100
+
+# how long members keep the birthday role
+BIRTHDAY_ROLE_DURATION = datetime.timedelta(days=1)
+# number of expired birthday roles removed per batch
+EXPIRY_BATCH_SIZE = 100
+
+# maximum number of guilds announcing birthdays at the same time
+ANNOUNCEMENT_CONCURRENCY = 10
+
+# missed days older than this are not announced after a restart
+MAX_CATCH_UP_DAYS = 7
+# seconds between the announcements of two missed days
+CATCH_UP_INTERVAL = 60
+
 
 class Month(Enum):
     January = 1
@@ -47,12 +87,20 @@ class Month(Enum):
     December = 12
 
 
-def get_next_occurence(date: datetime.date) -> datetime.datetime:
+def get_next_occurence(
+    date: datetime.date, schedule: Schedule | None = None
+) -> datetime.datetime:
     """Return a date object for the next occurence of the given birthday."""
 
+    if schedule is None:
+        schedule = Schedule()
+
     now = discord.utils.utcnow()
-    bday = datetime.datetime(
-        year=now.year, month=date.month, day=date.day, hour=12, tzinfo=datetime.UTC
+    tzinfo = schedule.tzinfo
+    bday = datetime.datetime.combine(
+        datetime.date(now.astimezone(tzinfo).year, date.month, date.day),
+        schedule.time,
+        tzinfo=tzinfo,
     )
 
     if (bday - now).total_seconds() < 0:
@@ -61,66 +109,414 @@ def get_next_occurence(date: datetime.date) -> datetime.datetime:
     return bday
 
 
+@cache
+def _timezones() -> list[str]:
+    """Sorted list of the available IANA timezones."""
+
+    return sorted(available_timezones())
+
+
+def _calendar_pages(
+    calendar_days: list[tuple[int, int, set[int]]],
+) -> list[list[tuple[int, int, list[int]]]]:
+    """Split the calendar days in pages of at most CALENDAR_PAGE_SIZE days and
+    CALENDAR_PAGE_NAMES members. Days with more members span several pages.
+    """
+
+    pages: list[list[tuple[int, int, list[int]]]] = [[]]
+    names = 0
+    for month, day, user_ids in calendar_days:
+        for batch in itertools.batched(sorted(user_ids), CALENDAR_PAGE_NAMES):
+            if (
+                len(pages[-1]) == CALENDAR_PAGE_SIZE
+                or names + len(batch) > CALENDAR_PAGE_NAMES
+            ):
+                pages.append([])
+                names = 0
+
+            pages[-1].append((month, day, list(batch)))
+            names += len(batch)
+
+    return pages
+
+
 class Announcements(commands.Cog):
     birthday = app_commands.Group(
         name="birthday", description="Save and celebrate server members' birthday!"
     )
+    cache_needs = CacheNeeds(
+        intents=discord.Intents(members=True),
+        fallback="the birthdays of departed members are only deleted once a day",
+    )
 
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
-        self.birthday_tasks: set[Task] = set()
+        self.calendar = BirthdayCalendar()
+        self.scheduler = BirthdayScheduler()
+        self.reactions = ReactionDispatcher(spawn=bot.supervisor.spawn)
+        # birthdays of departed members and guilds, waiting to be deleted
+        self._departed_members: set[tuple[int, int]] = set()
+        self._departed_guilds: set[int] = set()
+        # birthday role ID of each guild
+        self._birthday_roles: dict[int, int] = {}
 
     async def cog_load(self) -> None:
+        await self.load_calendar()
+        await self.load_schedules()
+        self._birthday_roles = await self._get_birthday_roles()
         self.birthday_announcement.start()
+        self.delete_departed.start()
+        self.reconcile_birthdays.start()
+        self.expire_birthday_roles.start()
 
     async def cog_unload(self) -> None:
         self.birthday_announcement.cancel()
+        self.delete_departed.cancel()
+        self.reconcile_birthdays.cancel()
+        self.expire_birthday_roles.cancel()
+        self.reactions.close()
+        await self._flush_departed()
+
+    async def load_calendar(self) -> None:
+        """Index the registered birthdays of the guilds on the bot's shards."""
+
+        for bday in await self._get_all_birthdays():
+            self.calendar.add(bday.guild_id, bday.user_id, bday.birthday)
 
-    @tasks.loop(time=datetime.time(hour=12, tzinfo=datetime.UTC))
+        LOGGER.debug("Loaded %s birthdays in the calendar", len(self.calendar))
+
+    async def load_schedules(self) -> None:
+        """Schedule the announcements of the guilds with birthdays or a schedule."""
+
+        schedules = {
+            config.guild_id: Schedule(config.time, config.timezone)
+            for config in await self._get_guild_configs()
+        }
+        for guild_id in self.calendar.guild_ids() | schedules.keys():
+            self.scheduler.schedule(guild_id, schedules.get(guild_id))
+
+        LOGGER.debug(
+            "Scheduled birthday announcements for %s guilds", len(self.scheduler)
+        )
+
+    @tasks.loop()
     async def birthday_announcement(self) -> None:
         """Accounce the birthday of a member.
         Birthdays need to be registered by the member beforehand
         with the `/birthday register` command.
+
+        Each guild's birthdays are announced at the guild's scheduled time.
         """
-        birthdays = await self._get_today_birthdays()
-        LOGGER.info(f"Found {len(birthdays)} birthdays for today")
 
-        for bday in birthdays:
-            guild = await self.bot.fetch_guild(bday.guild_id)
+        await self.scheduler.wait()
+        due = self.scheduler.pop_due(discord.utils.utcnow())
+        if not due:
+            return
+
+        for guild_id, _ in due:
+            self.scheduler.schedule(guild_id)
+
+        birthdays = await self._get_birthdays_on(due)
+        LOGGER.info("Found %s birthdays in %s guilds", len(birthdays), len(due))
+
+        await self.announce_birthdays(birthdays)
+        await self._save_last_announced(due)
+
+    @birthday_announcement.before_loop
+    async def birthday_announcement_before(self) -> None:
+        await self.bot.wait_until_ready()
+        self._create_birthday_task(self.catch_up_birthdays())
+
+    async def catch_up_birthdays(self) -> None:
+        """Announce the birthdays of the days missed while the bot was offline.
+
+        Missed days are announced one at a time, oldest first, to avoid sending
+        all of them at once after a long outage.
+        """
+
+        missed_days: defaultdict[datetime.date, list[int]] = defaultdict(list)
+        for guild_id, last_announced in (await self._get_last_announced()).items():
+            next_day = self.scheduler.next_day(guild_id)
+            if next_day is None:
+                continue
+
+            day = max(
+                last_announced + datetime.timedelta(days=1),
+                next_day - datetime.timedelta(days=MAX_CATCH_UP_DAYS),
+            )
+            while day < next_day:
+                missed_days[day].append(guild_id)
+                day += datetime.timedelta(days=1)
+
+        for n, day in enumerate(sorted(missed_days)):
+            if n > 0:
+                await asyncio.sleep(CATCH_UP_INTERVAL)
+
+            guild_dates = [(guild_id, day) for guild_id in missed_days[day]]
+            birthdays = await self._get_birthdays_on(guild_dates)
+            LOGGER.info(
+                "Catching up %s birthdays on %s in %s guilds",
+                len(birthdays),
+                day,
+                len(guild_dates),
+            )
+
+            await self.announce_birthdays(birthdays)
+            await self._save_last_announced(guild_dates)
+
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent) -> None:
+        """Forget the birthday of a member who left the guild."""
+
+        if (payload.guild_id, payload.user.id) in self.calendar:
+            self._forget_member(payload.guild_id, payload.user.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        """Forget the birthdays of the guild the bot left."""
+
+        if guild.id in self.calendar.guild_ids():
+            self._forget_guild(guild.id)
+
+    def _forget_member(self, guild_id: int, user_id: int) -> None:
+        """Remove the member's birthday from memory, and queue its deletion."""
+
+        self.calendar.remove(guild_id, user_id)
+        self._departed_members.add((guild_id, user_id))
+
+    def _forget_guild(self, guild_id: int) -> None:
+        """Remove the guild's birthdays from memory, and queue their deletion."""
+
+        LOGGER.debug("Forgetting the birthdays of guild %s", guild_id)
+        self.calendar.remove_guild(guild_id)
+        self.scheduler.unschedule(guild_id)
+        self._departed_guilds.add(guild_id)
+
+    @tasks.loop(minutes=1)
+    async def delete_departed(self) -> None:
+        """Delete the birthdays of the departed members and guilds."""
+
+        await self._flush_departed()
+
+    async def _flush_departed(self) -> None:
+        members, self._departed_members = self._departed_members, set()
+        guilds, self._departed_guilds = self._departed_guilds, set()
+        if members or guilds:
+            await self._delete_departed_birthdays(members, guilds)
+
+    @tasks.loop(hours=24)
+    async def reconcile_birthdays(self) -> None:
+        """Forget the birthdays of members who left while the bot was offline."""
+
+        for guild_id in self.calendar.guild_ids():
+            guild = self.bot.get_guild(guild_id)
             if guild is None:
-                # Bot left the guild maybe?
+                self._forget_guild(guild_id)
                 continue
 
+            if guild.unavailable:
+                continue
+
+            user_ids = self.calendar.user_ids(guild_id)
+            if guild.chunked:
+                # all the members are in cache, no need to fetch them
+                departed_ids = {
+                    user_id for user_id in user_ids if guild.get_member(user_id) is None
+                }
+            else:
+                try:
+                    members = await self.bot.get_or_fetch_members(guild, user_ids)
+                except (discord.HTTPException, TimeoutError):
+                    LOGGER.exception(
+                        "Could not fetch the members of guild %s", guild_id
+                    )
+                    continue
+                departed_ids = user_ids - members.keys()
+
+            for user_id in departed_ids:
+                self._forget_member(guild_id, user_id)
+
+        await self._flush_departed()
+
+    @reconcile_birthdays.before_loop
+    async def reconcile_birthdays_before(self) -> None:
+        await self.bot.wait_until_ready()
+
+    async def announce_birthdays(self, birthdays: list[Birthday]) -> None:
+        """Announce the birthdays, grouped by guild and concurrently across guilds."""
+
+        guild_birthdays: defaultdict[int, list[Birthday]] = defaultdict(list)
+        for bday in birthdays:
+            guild_birthdays[bday.guild_id].append(bday)
+
+        semaphore = asyncio.Semaphore(ANNOUNCEMENT_CONCURRENCY)
+        await asyncio.gather(
+            *(
+                self._announce_guild_birthdays(guild_id, bdays, semaphore)
+                for guild_id, bdays in guild_birthdays.items()
+            )
+        )
+
+    async def _announce_guild_birthdays(
+        self, guild_id: int, birthdays: list[Birthday], semaphore: asyncio.Semaphore
+    ) -> None:
+        """Announce the birthdays of a single guild."""
+
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            # Bot left the guild maybe?
+            LOGGER.debug("Can't find guild %s", guild_id)
+            return
+
+        async with semaphore:
             try:
-                member = await self.bot.get_or_fetch_member(guild, bday.user_id)
+                members = await self.bot.get_or_fetch_members(
+                    guild, [bday.user_id for bday in birthdays]
+                )
+            except (discord.HTTPException, TimeoutError):
+                LOGGER.exception("Could not fetch the members of guild %s", guild.id)
+                return
+
+            celebrated_members = []
+            for bday in birthdays:
+                member = members.get(bday.user_id)
                 if member is None:
                     # skip if we can't find the member
-                    LOGGER.debug(f"Can't fing member {bday.user_id}")
+                    LOGGER.debug("Can't find member %s", bday.user_id)
                     continue
-                # if we bring back the Birthday role,
-                # this needs to be called as a task
-                task = asyncio.create_task(self.birthday_task(member))
-                self.birthday_tasks.add(task)
-
-                task.add_done_callback(self.birthday_tasks.discard)
-            except discord.NotFound:
-                LOGGER.exception(
-                    f"Member {bday.user_id} was not found in guild {guild.id}."
-                )
 
-    @birthday_announcement.before_loop
-    async def birthday_announcement_before(self) -> None:
+                try:
+                    message = await self.send_birthday_message(member)
+                except discord.HTTPException:
+                    LOGGER.exception(
+                        "Could not announce the birthday of %s in guild %s.",
+                        member.id,
+                        guild.id,
+                    )
+                    continue
+
+                if message is not None:
+                    self.add_birthday_reactions(message)
+                celebrated_members.append(member)
+
+            await self._give_birthday_role(guild, celebrated_members)
+
+    async def _give_birthday_role(
+        self, guild: discord.Guild, members: list[discord.Member]
+    ) -> None:
+        """Give the guild's birthday role to the members, until it expires."""
+
+        role_id = self._birthday_roles.get(guild.id)
+        role = guild.get_role(role_id) if role_id is not None else None
+        if role is None or len(members) == 0:
+            return
+
+        expires_at = discord.utils.utcnow() + BIRTHDAY_ROLE_DURATION
+        given_members = []
+        for member in members:
+            try:
+                await member.add_roles(role, reason="Happy birthday!")
+            except discord.HTTPException:
+                LOGGER.exception("Could not give birthday role to %s", member.id)
+            else:
+                given_members.append(member)
+
+        await self._save_role_expiries(role, given_members, expires_at)
+
+    @tasks.loop(minutes=5)
+    async def expire_birthday_roles(self) -> None:
+        """Remove the birthday roles that expired, in batches.
+
+        The expiries whose role could not be removed are kept, and retried on
+        the next run.
+        """
+
+        after_id = 0
+        while expiries := await self._get_role_expiries(EXPIRY_BATCH_SIZE, after_id):
+            guild_expiries: defaultdict[int, list[RoleExpiry]] = defaultdict(list)
+            for expiry in expiries:
+                guild_expiries[expiry.guild_id].append(expiry)
+
+            done_ids = []
+            for guild_id, expiries_batch in guild_expiries.items():
+                done_ids += await self._remove_birthday_roles(guild_id, expiries_batch)
+
+            await self._delete_role_expiries(done_ids)
+            LOGGER.debug(
+                "Removed %s of %s expired birthday roles", len(done_ids), len(expiries)
+            )
+
+            if len(expiries) < EXPIRY_BATCH_SIZE:
+                break
+            after_id = expiries[-1].id
+
+    @expire_birthday_roles.before_loop
+    async def expire_birthday_roles_before(self) -> None:
         await self.bot.wait_until_ready()
 
+    async def _remove_birthday_roles(
+        self, guild_id: int, expiries: list[RoleExpiry]
+    ) -> list[int]:
+        """Remove the expired birthday roles of a single guild.
+
+        Return the IDs of the expiries that are done with, either because the
+        role was removed or because the guild, member or role is gone.
+        """
+
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            # nothing to remove if the bot left the guild
+            return [expiry.id for expiry in expiries]
+
+        try:
+            members = await self.bot.get_or_fetch_members(
+                guild, [expiry.user_id for expiry in expiries]
+            )
+        except (discord.HTTPException, TimeoutError):
+            LOGGER.exception("Could not fetch the members of guild %s", guild_id)
+            return []
+
+        done_ids = []
+        for expiry in expiries:
+            member = members.get(expiry.user_id)
+            role = guild.get_role(expiry.role_id)
+            if member is not None and role is not None:
+                try:
+                    await member.remove_roles(role, reason="Birthday is over.")
+                except discord.HTTPException:
+                    LOGGER.exception(
+                        "Could not remove birthday role from %s", member.id
+                    )
+                    continue
+
+            done_ids.append(expiry.id)
+
+        return done_ids
+
+    def _create_birthday_task(self, coro: Coroutine[Any, Any, None]) -> None:
+        self.bot.supervisor.spawn(coro, name=f"birthday-{coro.__name__}")
+
     async def birthday_task(self, member: discord.Member) -> None:
         """Task to send the birthday Embed to the member's guild's system channel."""
+
+        message = await self.send_birthday_message(member)
+        if message is not None:
+            self.add_birthday_reactions(message)
+
+    async def send_birthday_message(
+        self, member: discord.Member
+    ) -> discord.Message | None:
+        """Send the birthday Embed to the member's guild's system channel."""
+
         if member.guild.system_channel is None:
             LOGGER.debug(
-                f"Guild {member.guild.name} ({member.guild.id}) has no system_channel."
+                "Guild %s (%s) has no system_channel.",
+                member.guild.name,
+                member.guild.id,
             )
-            return
+            return None
 
-        LOGGER.debug(f"Celebrating {member}'s birthday")
+        LOGGER.debug("Celebrating %s's birthday", member)
         embed = (
             discord.Embed(
                 description=(
@@ -138,7 +534,11 @@ class Announcements(commands.Cog):
                 icon_url="https://em-content.zobj.net/thumbs/160/twitter/351/information_2139-fe0f.png",
             )
         )
-        message = await member.guild.system_channel.send(embed=embed)
+        return await member.guild.system_channel.send(embed=embed)
+
+    def add_birthday_reactions(self, message: discord.Message) -> None:
+        """Queue festive reactions to add to the birthday message."""
+
         reactions = [
             "\U0001f973",
             "\U0001f382",
@@ -147,9 +547,7 @@ class Announcements(commands.Cog):
         ]
         random.shuffle(reactions)
 
-        for reaction in reactions:
-            await message.add_reaction(reaction)
-            await asyncio.sleep(0.5)  # avoid rate limits
+        self.reactions.add_reactions(message, reactions)
 
     @birthday.command(name="register")
     @app_commands.describe(month="Month of the year", day="Day of the month (1-31)")
@@ -169,10 +567,20 @@ class Announcements(commands.Cog):
 
         # save year as a leap year. no need for user year of birth!
         birthday_date = datetime.date(4, month.value, day)
-        next_occurence = get_next_occurence(birthday_date)
-        LOGGER.debug(f"{interaction.user} registered birthday for {birthday_date}")
+        guild_id = interaction.user.guild.id
+        next_occurence = get_next_occurence(
+            birthday_date, self.scheduler.get_schedule(guild_id)
+        )
+        LOGGER.debug("%s registered birthday for %s", interaction.user, birthday_date)
+
+        if (guild_id, interaction.user.id) in self._departed_members:
+            # the member came back, delete their old birthday first
+            await self._flush_departed()
 
         await self._save_birthday(interaction.user, birthday_date)
+        self.calendar.add(guild_id, interaction.user.id, birthday_date)
+        if guild_id not in self.scheduler:
+            self.scheduler.schedule(guild_id)
 
         await interaction.response.send_message(
             f"Saved your birthday as {month.name} {day}. "
@@ -191,7 +599,7 @@ class Announcements(commands.Cog):
         if isinstance(error, ValueError):
             month = interaction.namespace.month
             day = interaction.namespace.day
-            LOGGER.debug(f"{day} is not in {month}")
+            LOGGER.debug("%s is not in %s", day, month)
             await interaction.response.send_message(
                 f"Day {day} is out of range for month {month}",
                 ephemeral=True,
@@ -216,31 +624,36 @@ class Announcements(commands.Cog):
             )
             return
 
-        guild_birthdays = await self._get_guild_birthdays(interaction.guild)
+        schedule = self.scheduler.get_schedule(interaction.guild.id)
+        now = discord.utils.utcnow().astimezone(schedule.tzinfo)
+        first_day = now.date()
+        if now.time() >= schedule.time:
+            # today's birthdays were already announced
+            first_day += datetime.timedelta(days=1)
+
+        next_birthdays = await self._get_next_birthdays(interaction.guild, first_day)
         # return early if there is no birthdays in the guild
-        if len(guild_birthdays) == 0:
+        if len(next_birthdays) == 0:
             await interaction.response.send_message(
                 "No birthdays registered here, sorry!",
                 ephemeral=True,
             )
             return
 
-        next_guild_birthdays = sorted(
-            guild_birthdays, key=lambda x: get_next_occurence(x.birthday)
-        )
-        next_birthday_date, next_birthdays = next(
-            itertools.groupby(next_guild_birthdays, key=lambda x: x.birthday)
+        next_birthday = get_next_occurence(next_birthdays[0].birthday, schedule)
+        members = await self.bot.get_or_fetch_members(
+            interaction.guild, [bday.user_id for bday in next_birthdays]
         )
-        next_birthday = get_next_occurence(next_birthday_date)
+        # filter out birthdays with None as members (they left the guild)
         next_birthday_members = [
-            await self.bot.get_or_fetch_member(interaction.guild, bday.user_id)
+            member
             for bday in next_birthdays
+            if (member := members.get(bday.user_id)) is not None
         ]
-        # filter out birthdays with None as members (they left the guild)
-        next_birthday_members = [m for m in next_birthday_members if m is not None]
         LOGGER.debug(
-            f"Next birthday(s) on {next_birthday} for "
-            f"{len(next_birthday_members)} members"
+            "Next birthday(s) on %s for %s members",
+            next_birthday,
+            len(next_birthday_members),
         )
 
         embed = (
@@ -254,7 +667,6 @@ class Announcements(commands.Cog):
                     [
                         f"{member.display_name} ({member.mention})"
                         for member in next_birthday_members
-                        if member is not None
                     ]
                 ),
             )
@@ -270,6 +682,64 @@ class Announcements(commands.Cog):
 
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
+    @birthday.command(name="calendar")
+    @app_commands.describe(month="Month to show, or the next twelve months if omitted")
+    async def birthday_calendar(
+        self, interaction: discord.Interaction, month: Month | None = None
+    ) -> None:
+        """Browse the birthdays registered in the server."""
+
+        guild = interaction.guild
+        if guild is None:
+            await interaction.response.send_message(
+                "Cannot get birthdays in direct messages."
+            )
+            return
+
+        if month is None:
+            schedule = self.scheduler.get_schedule(guild.id)
+            current_month = discord.utils.utcnow().astimezone(schedule.tzinfo).month
+            months = [(current_month + n - 1) % 12 + 1 for n in range(12)]
+        else:
+            months = [month.value]
+
+        calendar_days = [
+            (m, day, user_ids)
+            for m in months
+            for day, user_ids in self.calendar.get_month(guild.id, m)
+        ]
+        if len(calendar_days) == 0:
+            await interaction.response.send_message(
+                "No birthdays registered here, sorry!",
+                ephemeral=True,
+            )
+            return
+
+        pages = _calendar_pages(calendar_days)
+
+        async def get_page(index: int) -> discord.Embed:
+            page = pages[index]
+            members = await self.bot.get_or_fetch_members(
+                guild, [user_id for *_, user_ids in page for user_id in user_ids]
+            )
+            lines = []
+            for m, day, user_ids in page:
+                names = sorted(
+                    members[user_id].display_name
+                    for user_id in user_ids
+                    if user_id in members
+                )
+                if names:
+                    lines.append(f"**{Month(m).name} {day}**: {', '.join(names)}")
+
+            return discord.Embed(
+                title="Birthday Calendar",
+                description="\n".join(lines) or "No members to celebrate here.",
+                color=EMBED_COLOR,
+            )
+
+        await paginate(interaction, get_page, len(pages))
+
     @birthday.command(name="celebrate")
     @app_commands.checks.has_permissions(mention_everyone=True)
     @app_commands.describe(member="The person whose birthday is today!")
@@ -278,18 +748,111 @@ class Announcements(commands.Cog):
     ) -> None:
         """Celebrate a member's birthday!"""
 
-        task = asyncio.create_task(self.birthday_task(member))
-        self.birthday_tasks.add(task)
-        task.add_done_callback(self.birthday_tasks.discard)
+        self._create_birthday_task(self.birthday_task(member))
         await interaction.response.send_message(
             f"Thank you for celebrating {member.mention}!", ephemeral=True
         )
 
+    @birthday.command(name="schedule")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    @app_commands.describe(
+        hour="Hour of the day (0-23)",
+        minute="Minute of the hour (0-59)",
+        timezone="Timezone of the server, for example America/Montreal",
+    )
+    async def birthday_schedule(
+        self,
+        interaction: discord.Interaction,
+        hour: app_commands.Range[int, 0, 23],
+        minute: app_commands.Range[int, 0, 59] = 0,
+        timezone: str = "UTC",
+    ) -> None:
+        """Set the time at which birthdays are announced in this server."""
+
+        if interaction.guild is None:
+            await interaction.response.send_message(
+                "Cannot schedule birthdays in direct messages."
+            )
+            return
+
+        if timezone not in _timezones():
+            await interaction.response.send_message(
+                f"Unknown timezone {timezone}.", ephemeral=True
+            )
+            return
+
+        schedule = Schedule(datetime.time(hour, minute), timezone)
+        await self._save_guild_config(interaction.guild, schedule)
+        next_run = self.scheduler.schedule(interaction.guild.id, schedule)
+        LOGGER.debug("Birthdays in %s scheduled at %s", interaction.guild, schedule)
+
+        await interaction.response.send_message(
+            f"Birthdays will be announced every day at {format_dt(next_run, 't')}. "
+            f"Next announcement {relative_dt(next_run)}.",
+            ephemeral=True,
+        )
+
+    @birthday_schedule.autocomplete("timezone")
+    async def birthday_schedule_timezone_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> list[app_commands.Choice[str]]:
+        current = current.lower()
+        return [
+            app_commands.Choice(name=timezone, value=timezone)
+            for timezone in _timezones()
+            if current in timezone.lower()
+        ][:25]
+
+    @birthday.command(name="role")
+    @app_commands.checks.has_permissions(manage_roles=True)
+    @app_commands.describe(
+        role="Role given to members on their birthday. Removes it if omitted."
+    )
+    async def birthday_role(
+        self, interaction: discord.Interaction, role: discord.Role | None = None
+    ) -> None:
+        """Set the role given to members for the day of their birthday."""
+
+        guild = interaction.guild
+        if guild is None:
+            await interaction.response.send_message(
+                "Cannot set a birthday role in direct messages."
+            )
+            return
+
+        if role is None:
+            await self._delete_birthday_role(guild)
+            self._birthday_roles.pop(guild.id, None)
+            await interaction.response.send_message(
+                "Members will not get a role on their birthday anymore.",
+                ephemeral=True,
+            )
+            return
+
+        if role.managed or role >= guild.me.top_role:
+            await interaction.response.send_message(
+                f"I cannot give the role {role.mention}, "
+                "it needs to be below my highest role.",
+                ephemeral=True,
+            )
+            return
+
+        await self._save_birthday_role(role)
+        self._birthday_roles[guild.id] = role.id
+        LOGGER.debug("Birthday role of %s set to %s", guild, role)
+
+        await interaction.response.send_message(
+            f"Members will get the role {role.mention} for a day on their birthday.",
+            ephemeral=True,
+        )
+
     @birthday_celebrate.error
-    async def birthday_celebrate_error(
+    @birthday_role.error
+    @birthday_schedule.error
+    async def birthday_permissions_error(
         self, interaction: discord.Interaction, error: app_commands.AppCommandError
     ) -> None:
-        """Error handler for the birthday celebrate subcommand."""
+        """Error handler for the birthday subcommands with permissions checks."""
 
         error = getattr(error, "original", error)
 
@@ -314,7 +877,7 @@ class Announcements(commands.Cog):
             return
 
         birthday = await self._get_member_birthday(interaction.user)
-        LOGGER.debug(f"Retreived birthday is {birthday}")
+        LOGGER.debug("Retreived birthday is %s", birthday)
 
         if birthday is None:
             await interaction.response.send_message(
@@ -323,7 +886,9 @@ class Announcements(commands.Cog):
             )
             return
 
-        next_occurence = get_next_occurence(birthday.birthday)
+        next_occurence = get_next_occurence(
+            birthday.birthday, self.scheduler.get_schedule(interaction.user.guild.id)
+        )
         confirm = await confirm_prompt(
             interaction,
             "Are you sure you want to delete your birthday on "
@@ -338,9 +903,10 @@ class Announcements(commands.Cog):
 
         if confirm.value:
             LOGGER.debug(
-                f"Deleting birthday for {interaction.user} in {interaction.guild}"
+                "Deleting birthday for %s in %s", interaction.user, interaction.guild
             )
             await self._delete_birthday(interaction.user)
+            self.calendar.remove(interaction.user.guild.id, interaction.user.id)
             content = "Deleting your birthday!"
 
         else:
@@ -348,12 +914,31 @@ class Announcements(commands.Cog):
 
         await confirm.interaction.response.send_message(content, ephemeral=True)
 
-    async def _get_guild_birthdays(self, guild: discord.Guild) -> list[Birthday]:
-        """Get a guild's birthdays."""
+    async def _get_next_birthdays(
+        self, guild: discord.Guild, first_day: datetime.date
+    ) -> list[Birthday]:
+        """Get the guild's birthdays on the first date with birthdays, starting
+        from the given day and wrapping around the end of the year.
+        """
+
+        def first_month_day(*where: ColumnElement[bool]) -> ScalarSelect:
+            return (
+                select(func.min(BIRTHDAY_MONTH_DAY))
+                .where(Birthday.guild_id == guild.id, *where)
+                .scalar_subquery()
+            )
+
+        next_month_day = func.coalesce(
+            first_month_day(BIRTHDAY_MONTH_DAY >= first_day.strftime("%m-%d")),
+            first_month_day(),
+        )
 
         async with self.bot.db.session() as session:
             birthdays = await session.scalars(
-                select(Birthday).where(Birthday.guild_id == guild.id)
+                select(Birthday).where(
+                    Birthday.guild_id == guild.id,
+                    BIRTHDAY_MONTH_DAY == next_month_day,
+                )
             )
 
         return list(birthdays)
@@ -369,22 +954,232 @@ class Announcements(commands.Cog):
                 )
             )
 
-    async def _get_today_birthdays(
-        self, guild: discord.Guild | None = None
+    async def _get_birthdays_on(
+        self, guild_dates: list[tuple[int, datetime.date]]
     ) -> list[Birthday]:
-        """Return a list of today's birthdays.
-        The list is empty if there is none.
+        """Return the birthdays of the guilds on their given date."""
+
+        date_guilds: defaultdict[datetime.date, list[int]] = defaultdict(list)
+        for guild_id, date in guild_dates:
+            date_guilds[date.replace(year=4)].append(guild_id)
+
+        async with self.bot.db.session() as session:
+            birthdays = await session.scalars(
+                select(Birthday).where(
+                    or_(
+                        *(
+                            and_(
+                                Birthday.birthday == date,
+                                Birthday.guild_id.in_(guild_ids),
+                            )
+                            for date, guild_ids in date_guilds.items()
+                        )
+                    )
+                )
+            )
+
+        return list(birthdays)
+
+    def _on_own_shards(self, guild_id: ColumnElement[int]) -> ColumnElement[bool]:
+        """Filter the rows to the guilds handled by the bot's shards, so
+        processes running different shards share the work on the database.
         """
 
+        shard_ids = self.bot.own_shard_ids
+        if shard_ids is None:
+            return true()
+
+        return (guild_id.op(">>")(22) % (self.bot.shard_count or 1)).in_(shard_ids)
+
+    async def _get_all_birthdays(self) -> list[Birthday]:
+        """Return the registered birthdays of the guilds on the bot's shards."""
+
         async with self.bot.db.session() as session:
-            today = discord.utils.utcnow().date()
-            query = select(Birthday).where(Birthday.birthday == today.replace(year=4))
-            if guild is not None:
-                query = query.where(Birthday.guild_id == guild.id)
-            birthdays = await session.scalars(query)
+            birthdays = await session.scalars(
+                select(Birthday).where(self._on_own_shards(Birthday.guild_id))
+            )
 
         return list(birthdays)
 
+    async def _get_guild_configs(self) -> list[GuildConfig]:
+        """Return the announcements configuration of the guilds on the bot's
+        shards.
+        """
+
+        async with self.bot.db.session() as session:
+            configs = await session.scalars(
+                select(GuildConfig).where(self._on_own_shards(GuildConfig.guild_id))
+            )
+
+        return list(configs)
+
+    async def _get_last_announced(self) -> dict[int, datetime.date]:
+        """Return the date of the last announcement of each guild."""
+
+        async with self.bot.db.session() as session:
+            runs = await session.scalars(select(AnnouncementRun))
+
+        return {run.guild_id: run.last_announced for run in runs}
+
+    async def _save_last_announced(
+        self, guild_dates: list[tuple[int, datetime.date]]
+    ) -> None:
+        """Save the date of the last announcement of the guilds.
+
+        The dates only move forward, so a catch up finishing after the regular
+        announcement does not make the next restart announce that day again.
+        """
+
+        query = insert(AnnouncementRun)
+        async with self.bot.db.session() as session, session.begin():
+            await session.execute(
+                query.on_conflict_do_update(
+                    index_elements=[AnnouncementRun.guild_id],
+                    set_={"last_announced": query.excluded.last_announced},
+                    where=AnnouncementRun.last_announced
+                    < query.excluded.last_announced,
+                ),
+                [
+                    {"guild_id": guild_id, "last_announced": date}
+                    for guild_id, date in guild_dates
+                ],
+            )
+
+    async def _delete_departed_birthdays(
+        self, members: set[tuple[int, int]], guild_ids: set[int]
+    ) -> None:
+        """Delete the birthdays of the members and guilds, in batches
+        in a single transaction.
+        """
+
+        async with self.bot.db.session() as session, session.begin():
+            for batch in itertools.batched(guild_ids, DELETE_BATCH_SIZE):
+                await session.execute(
+                    delete(Birthday).where(Birthday.guild_id.in_(batch))
+                )
+            for batch in itertools.batched(members, DELETE_BATCH_SIZE):
+                await session.execute(
+                    delete(Birthday).where(
+                        tuple_(Birthday.guild_id, Birthday.user_id).in_(batch)
+                    )
+                )
+
+        LOGGER.debug(
+            "Deleted birthdays of %s members and %s guilds",
+            len(members),
+            len(guild_ids),
+        )
+
+    async def _get_birthday_roles(self) -> dict[int, int]:
+        """Return the birthday role ID of each guild."""
+
+        async with self.bot.db.session() as session:
+            birthday_roles = await session.scalars(select(BirthdayRole))
+
+        return {
+            birthday_role.guild_id: birthday_role.role_id
+            for birthday_role in birthday_roles
+        }
+
+    async def _save_birthday_role(self, role: discord.Role) -> None:
+        """Save or replace the guild's birthday role."""
+
+        query = insert(BirthdayRole).values(guild_id=role.guild.id, role_id=role.id)
+        async with self.bot.db.session() as session, session.begin():
+            await session.execute(
+                query.on_conflict_do_update(
+                    index_elements=[BirthdayRole.guild_id],
+                    set_={"role_id": query.excluded.role_id},
+                )
+            )
+
+    async def _delete_birthday_role(self, guild: discord.Guild) -> None:
+        """Delete the guild's birthday role."""
+
+        async with self.bot.db.session() as session, session.begin():
+            await session.execute(
+                delete(BirthdayRole).where(BirthdayRole.guild_id == guild.id)
+            )
+
+    async def _get_role_expiries(self, limit: int, after_id: int) -> list[RoleExpiry]:
+        """Return the expired birthday roles of the guilds on the bot's shards,
+        with an ID greater than after_id.
+        """
+
+        async with self.bot.db.session() as session:
+            expiries = await session.scalars(
+                select(RoleExpiry)
+                .where(
+                    RoleExpiry.id > after_id,
+                    RoleExpiry.expires_at <= discord.utils.utcnow(),
+                    self._on_own_shards(RoleExpiry.guild_id),
+                )
+                .order_by(RoleExpiry.id)
+                .limit(limit)
+            )
+
+        return list(expiries)
+
+    async def _save_role_expiries(
+        self,
+        role: discord.Role,
+        members: list[discord.Member],
+        expires_at: datetime.datetime,
+    ) -> None:
+        """Save when the birthday role of the members expires."""
+
+        if len(members) == 0:
+            return
+
+        query = insert(RoleExpiry)
+        async with self.bot.db.session() as session, session.begin():
+            await session.execute(
+                query.on_conflict_do_update(
+                    index_elements=[
+                        RoleExpiry.guild_id,
+                        RoleExpiry.user_id,
+                        RoleExpiry.role_id,
+                    ],
+                    set_={"expires_at": query.excluded.expires_at},
+                ),
+                [
+                    {
+                        "expires_at": expires_at,
+                        "guild_id": role.guild.id,
+                        "role_id": role.id,
+                        "user_id": member.id,
+                    }
+                    for member in members
+                ],
+            )
+
+    async def _delete_role_expiries(self, expiry_ids: list[int]) -> None:
+        """Delete the birthday roles expiries."""
+
+        async with self.bot.db.session() as session, session.begin():
+            await session.execute(
+                delete(RoleExpiry).where(RoleExpiry.id.in_(expiry_ids))
+            )
+
+    async def _save_guild_config(
+        self, guild: discord.Guild, schedule: Schedule
+    ) -> None:
+        """Save or replace the guild's announcements schedule."""
+
+        query = insert(GuildConfig).values(
+            guild_id=guild.id, time=schedule.time, timezone=schedule.timezone
+        )
+        async with self.bot.db.session() as session, session.begin():
+            await session.execute(
+                query.on_conflict_do_update(
+                    index_elements=[GuildConfig.guild_id],
+                    set_={
+                        "time": query.excluded.time,
+                        "timezone": query.excluded.timezone,
+                    },
+                )
+            )
+
     async def _save_birthday(
         self, member: discord.Member, birthday: datetime.date
     ) -> None:
@@ -410,4 +1205,4 @@ class Announcements(commands.Cog):
                 )
             )
             await session.commit()
-        LOGGER.debug(f"Birthday deleted for {member}")
+        LOGGER.debug("Birthday deleted for %s", member)
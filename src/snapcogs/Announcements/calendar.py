@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import datetime
+
+
+class BirthdayCalendar:
+    """In-memory index of the registered birthdays of each guild,
+    bucketed by month and day.
+    """
+
+    def __init__(self) -> None:
+        # guild ID -> month -> day -> user IDs
+        self._months: defaultdict[int, defaultdict[int, defaultdict[int, set[int]]]] = (
+            defaultdict(lambda: defaultdict(lambda: defaultdict(set)))
+        )
+        # (guild ID, user ID) -> birthday
+        self._birthdays: dict[tuple[int, int], datetime.date] = {}
+
+    def __len__(self) -> int:
+        return len(self._birthdays)
+
+    def __contains__(self, key: tuple[int, int]) -> bool:
+        """Check if the (guild ID, user ID) pair has a birthday."""
+
+        return key in self._birthdays
+
+    def guild_ids(self) -> set[int]:
+        """Return the IDs of the guilds with birthdays."""
+
+        return set(self._months)
+
+    def user_ids(self, guild_id: int) -> set[int]:
+        """Return the IDs of the members of the guild with birthdays."""
+
+        return {
+            user_id
+            for days in self._months.get(guild_id, {}).values()
+            for user_ids in days.values()
+            for user_id in user_ids
+        }
+
+    def add(self, guild_id: int, user_id: int, birthday: datetime.date) -> None:
+        """Add or move the birthday of the member."""
+
+        self.remove(guild_id, user_id)
+        self._months[guild_id][birthday.month][birthday.day].add(user_id)
+        self._birthdays[guild_id, user_id] = birthday
+
+    def remove(self, guild_id: int, user_id: int) -> None:
+        """Remove the birthday of the member, if it is registered."""
+
+        birthday = self._birthdays.pop((guild_id, user_id), None)
+        if birthday is None:
+            return
+
+        months = self._months[guild_id]
+        days = months[birthday.month]
+        days[birthday.day].discard(user_id)
+
+        # remove empty buckets
+        if not days[birthday.day]:
+            del days[birthday.day]
+            if not days:
+                del months[birthday.month]
+                if not months:
+                    del self._months[guild_id]
+
+    def remove_guild(self, guild_id: int) -> None:
+        """Remove all the birthdays of the guild."""
+
+        for user_id in self.user_ids(guild_id):
+            del self._birthdays[guild_id, user_id]
+
+        self._months.pop(guild_id, None)
+
+    def get_month(self, guild_id: int, month: int) -> list[tuple[int, set[int]]]:
+        """Return the days of the month with birthdays in the guild, in order,
+        with the IDs of the members born on that day.
+        """
+
+        if guild_id not in self._months:
+            return []
+
+        days = self._months[guild_id].get(month, {})
+        return [(day, set(days[day])) for day in sorted(days)]
@@ -1,9 +1,12 @@
 import datetime
 
 from sqlalchemy import (
+    Index,
     UniqueConstraint,
+    func,
+    literal_column,
 )
-from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import Mapped, mapped_column
 
 from ..database import Base
 
@@ -15,3 +18,46 @@ class Birthday(Base):
     birthday: Mapped[datetime.date]
     guild_id: Mapped[int]
     user_id: Mapped[int]
+
+
+# "MM-DD" of the birthday, to compare and sort birthdays in the year.
+# The format is a literal so queries use the same expression as the index.
+BIRTHDAY_MONTH_DAY = func.strftime(literal_column("'%m-%d'"), Birthday.birthday)
+
+Index(
+    "ix_announcements_birthday_guild_id_month_day",
+    Birthday.guild_id,
+    BIRTHDAY_MONTH_DAY,
+)
+
+
+class GuildConfig(Base):
+    __tablename__ = "announcements_guild_config"
+
+    guild_id: Mapped[int] = mapped_column(unique=True)
+    time: Mapped[datetime.time]
+    timezone: Mapped[str]
+
+
+class AnnouncementRun(Base):
+    __tablename__ = "announcements_run"
+
+    guild_id: Mapped[int] = mapped_column(unique=True)
+    last_announced: Mapped[datetime.date]
+
+
+class BirthdayRole(Base):
+    __tablename__ = "announcements_birthday_role"
+
+    guild_id: Mapped[int] = mapped_column(unique=True)
+    role_id: Mapped[int]
+
+
+class RoleExpiry(Base):
+    __tablename__ = "announcements_role_expiry"
+    __table_args__ = (UniqueConstraint("guild_id", "user_id", "role_id"),)
+
+    expires_at: Mapped[datetime.datetime] = mapped_column(index=True)
+    guild_id: Mapped[int]
+    role_id: Mapped[int]
+    user_id: Mapped[int]
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+import discord
+
+if TYPE_CHECKING:
+    from asyncio import Task
+    from collections.abc import Callable, Coroutine, Iterable
+    from typing import Any
+
+    type Spawn = Callable[[Coroutine[Any, Any, None]], Task]
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ReactionDispatcher:
+    """Add reactions to messages in the background, shared by all the messages.
+
+    Reactions are added one at a time per channel, which is the scope of the
+    reactions rate limit, and discord.py's rate limiter waits on the limits
+    returned by Discord instead of a fixed delay. Each channel alternates
+    between its messages, so every message gets its first reaction early.
+    """
+
+    def __init__(self, *, spawn: Spawn = asyncio.create_task) -> None:
+        self._spawn = spawn
+        self._queues: dict[int, deque[tuple[discord.Message, deque[str]]]] = {}
+        self._workers: dict[int, Task] = {}
+        self.added = 0
+        self.failed = 0
+        self._active_time = 0.0
+        self._active_since: float | None = None
+
+    @property
+    def pending(self) -> int:
+        """Number of reactions waiting to be added."""
+
+        return sum(
+            len(reactions) for queue in self._queues.values() for _, reactions in queue
+        )
+
+    @property
+    def reactions_per_second(self) -> float:
+        """Reactions added per second while the dispatcher was busy."""
+
+        active_time = self._active_time
+        if self._active_since is not None:
+            active_time += time.monotonic() - self._active_since
+
+        return self.added / active_time if active_time else 0.0
+
+    def add_reactions(self, message: discord.Message, reactions: Iterable[str]) -> None:
+        """Queue the reactions to add to the message, in order."""
+
+        queue = self._queues.setdefault(message.channel.id, deque())
+        queue.append((message, deque(reactions)))
+
+        if message.channel.id not in self._workers:
+            if not self._workers:
+                self._active_since = time.monotonic()
+
+            self._workers[message.channel.id] = self._spawn(
+                self._drain(message.channel.id)
+            )
+
+    def close(self) -> None:
+        """Cancel the pending reactions."""
+
+        for worker in self._workers.values():
+            worker.cancel()
+
+        self._queues.clear()
+
+    async def _drain(self, channel_id: int) -> None:
+        """Add the channel's reactions, alternating between its messages."""
+
+        queue = self._queues[channel_id]
+        try:
+            while queue:
+                message, reactions = queue.popleft()
+                try:
+                    await message.add_reaction(reactions.popleft())
+                except discord.NotFound:
+                    # message was deleted, skip its other reactions
+                    self.failed += 1 + len(reactions)
+                    continue
+                except discord.HTTPException:
+                    LOGGER.exception("Could not add reaction to message %s", message.id)
+                    self.failed += 1
+                else:
+                    self.added += 1
+
+                if reactions:
+                    queue.append((message, reactions))
+
+        finally:
+            del self._workers[channel_id]
+            if not queue:
+                self._queues.pop(channel_id, None)
+
+            if not self._workers and self._active_since is not None:
+                self._active_time += time.monotonic() - self._active_since
+                self._active_since = None
+                LOGGER.debug(
+                    "Added %s reactions (%.2f reactions/s)",
+                    self.added,
+                    self.reactions_per_second,
+                )
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import heapq
+from dataclasses import dataclass
+from zoneinfo import ZoneInfo
+
+import discord
+
+
+@dataclass(frozen=True)
+class Schedule:
+    """Local time of the day at which a guild's birthdays are announced."""
+
+    time: datetime.time = datetime.time(hour=12)
+    timezone: str = "UTC"
+
+    @property
+    def tzinfo(self) -> ZoneInfo:
+        return ZoneInfo(self.timezone)
+
+    def next_run(self, now: datetime.datetime) -> datetime.datetime:
+        """Return the first announcement time after now, in UTC."""
+
+        tzinfo = self.tzinfo
+        day = now.astimezone(tzinfo).date()
+        while True:
+            run = datetime.datetime.combine(day, self.time, tzinfo=tzinfo)
+            if run > now:
+                return run.astimezone(datetime.UTC)
+
+            day += datetime.timedelta(days=1)
+
+
+class BirthdayScheduler:
+    """Min-heap of the next birthday announcement time of each guild.
+
+    Rescheduling a guild pushes a new entry and leaves the previous one in the
+    heap, where it is skipped when it reaches the top.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime.datetime, int]] = []
+        self._runs: dict[int, datetime.datetime] = {}
+        self._schedules: dict[int, Schedule] = {}
+        self._changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def __contains__(self, guild_id: int) -> bool:
+        return guild_id in self._runs
+
+    def get_schedule(self, guild_id: int) -> Schedule:
+        """Return the guild's schedule, or the default one if it has none."""
+
+        return self._schedules.get(guild_id, Schedule())
+
+    def next_day(self, guild_id: int) -> datetime.date | None:
+        """Return the local date of the guild's next announcement, if scheduled."""
+
+        run = self._runs.get(guild_id)
+        if run is None:
+            return None
+
+        return run.astimezone(self.get_schedule(guild_id).tzinfo).date()
+
+    def schedule(
+        self, guild_id: int, schedule: Schedule | None = None
+    ) -> datetime.datetime:
+        """Schedule the next announcement of the guild, and return its time.
+
+        If a schedule is given, it replaces the guild's current one.
+        """
+
+        if schedule is not None:
+            self._schedules[guild_id] = schedule
+
+        run = self.get_schedule(guild_id).next_run(discord.utils.utcnow())
+        self._runs[guild_id] = run
+        heapq.heappush(self._heap, (run, guild_id))
+        self._changed.set()
+
+        return run
+
+    def unschedule(self, guild_id: int) -> None:
+        """Remove the guild from the scheduler."""
+
+        self._runs.pop(guild_id, None)
+        self._schedules.pop(guild_id, None)
+
+    def pop_due(self, now: datetime.datetime) -> list[tuple[int, datetime.date]]:
+        """Remove and return the guilds whose announcement is due,
+        with the local date of the announcement.
+        """
+
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            run, guild_id = heapq.heappop(self._heap)
+            if self._runs.get(guild_id) != run:
+                # rescheduled or unscheduled since
+                continue
+
+            del self._runs[guild_id]
+            tzinfo = self.get_schedule(guild_id).tzinfo
+            due.append((guild_id, run.astimezone(tzinfo).date()))
+
+        return due
+
+    async def wait(self) -> None:
+        """Sleep until the earliest announcement is due, or the schedule changes."""
+
+        self._changed.clear()
+        while self._heap and self._runs.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+        timeout = None
+        if self._heap:
+            delay = self._heap[0][0] - discord.utils.utcnow()
+            timeout = max(delay.total_seconds(), 0)
+
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except TimeoutError:
+            pass
@@ -9,9 +9,9 @@ from pathlib import Path
 import discord
 from discord import app_commands
 from discord.ext import commands
-from PIL import Image, ImageDraw, ImageFont, ImageOps, ImageSequence
 
 from ..bot import Bot
+from ..cache import CacheNeeds
 
 LOGGER = logging.getLogger(__name__)
 COG_PATH = Path(__file__).parent.resolve()
@@ -23,6 +23,9 @@ MAX_IMG_SIZE = (_max_img, _max_img)
 class Fun(commands.Cog):
     """Collection of useless but fun commands."""
 
+    # the members come with the interactions
+    cache_needs = CacheNeeds()
+
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
 
@@ -41,6 +44,11 @@ class Fun(commands.Cog):
         )
         self.bot.tree.add_command(self.mock_context_menu)
 
+    def warm_up(self) -> None:
+        """Import Pillow ahead of the first image command."""
+
+        from PIL import Image, ImageDraw, ImageFont, ImageOps, ImageSequence  # noqa: F401
+
     @app_commands.command(name="8ball")
     @app_commands.allowed_installs(guilds=True, users=True)
     @app_commands.describe(question="What do you want to ask the Magic 8 Ball?")
@@ -173,6 +181,8 @@ class Fun(commands.Cog):
         await interaction.response.send_message(file=file)
 
     def _assemble_8ball_image(self, avatar_bytes: io.BytesIO) -> io.BytesIO:
+        from PIL import Image
+
         # needed files
         avatar = Image.open(avatar_bytes)
         template = Image.open(COG_PATH / "8ball_filter.png")
@@ -208,6 +218,8 @@ class Fun(commands.Cog):
     def _assemble_bonk_image(
         self, avatar_bytes: io.BytesIO, text: str | None = None
     ) -> io.BytesIO:
+        from PIL import Image, ImageDraw, ImageFont
+
         avatar = Image.open(avatar_bytes)
         template = Image.open(COG_PATH / "bonk_template.png")
 
@@ -247,6 +259,8 @@ class Fun(commands.Cog):
         return edited
 
     def _assemble_self_bonk_image(self, avatar_bytes: io.BytesIO) -> io.BytesIO:
+        from PIL import Image
+
         avatar = Image.open(avatar_bytes)
         template = Image.open(COG_PATH / "self_bonk.png")
 
@@ -264,6 +278,8 @@ class Fun(commands.Cog):
         return edited
 
     def _assemble_lick_gif(self, avatar_bytes: io.BytesIO) -> io.BytesIO:
+        from PIL import Image, ImageDraw, ImageOps, ImageSequence
+
         avatar = Image.open(avatar_bytes)
         lick_gif = Image.open(COG_PATH / "lick_template.gif")
         size = (lick_gif.size[1], lick_gif.size[1])
@@ -298,6 +314,8 @@ class Fun(commands.Cog):
         return _bytes
 
     def _assemble_kirby_image(self, avatar_bytes: io.BytesIO) -> io.BytesIO:
+        from PIL import Image
+
         avatar = Image.open(avatar_bytes)
         template = Image.open(COG_PATH / "kirby_template.png")
 
@@ -330,6 +348,8 @@ class Fun(commands.Cog):
         return "".join(mocked_text)
 
     def _assemble_mock_image(self, text: str) -> io.BytesIO:
+        from PIL import Image, ImageDraw, ImageFont
+
         template = Image.open(COG_PATH / "mock_template.png")
         draw = ImageDraw.Draw(template)
         font = ImageFont.truetype("impact.ttf", 55)
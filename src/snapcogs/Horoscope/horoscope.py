@@ -1,12 +1,16 @@
+from __future__ import annotations
+
 from enum import IntEnum
+from typing import TYPE_CHECKING
 
 import discord
-from aiohttp import ClientSession
-from bs4 import BeautifulSoup, Tag
 from discord import Interaction, app_commands
 from discord.ext import commands
 
-from ..bot import Bot
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+    from ..bot import Bot
 
 HOROSCOPE_BASE_URL = (
     "https://www.horoscope.com/us/horoscopes/general/horoscope-general-daily-today.aspx"
@@ -46,6 +50,8 @@ async def get_today_horoscope(
 ) -> str:
     """Get today's horoscope text from horoscope.com for the given zodiac sign."""
 
+    from bs4 import BeautifulSoup, Tag
+
     resp = await session.get(HOROSCOPE_BASE_URL, params={"sign": zodiac_sign})
     soup = BeautifulSoup(await resp.text(), PARSER)
     data = soup.find("div", attrs={"class": "main-horoscope"})
@@ -65,6 +71,8 @@ async def get_today_star_rating(
 ) -> list[tuple[str, str]]:
     """Get today's star rating from horoscope.com for the given zodiac sign."""
 
+    from bs4 import BeautifulSoup, Tag
+
     resp = await session.get(f"{STAR_RATING_BASE_URL}{zodiac_sign.name}")
     soup = BeautifulSoup(await resp.text(), PARSER)
 
@@ -96,6 +104,11 @@ class Horoscope(commands.Cog):
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
 
+    def warm_up(self) -> None:
+        """Import BeautifulSoup ahead of its first use."""
+
+        import bs4  # noqa: F401
+
     @app_commands.command()
     @app_commands.describe(zodiac_sign="The Zodiac sign to get the horoscope of.")
     async def horoscope(
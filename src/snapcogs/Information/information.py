@@ -5,6 +5,7 @@ from discord import app_commands
 from discord.ext import commands
 
 from ..bot import Bot
+from ..cache import CacheNeeds
 from ..utils import relative_dt, run_process
 
 LOGGER = logging.getLogger(__name__)
@@ -18,6 +19,10 @@ class Information(commands.Cog):
     info = app_commands.Group(
         name="info", description="Get information about something"
     )
+    cache_needs = CacheNeeds(
+        intents=discord.Intents(members=True, presences=True),
+        fallback="/about shows only the total of members, without the online ones",
+    )
 
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
@@ -48,16 +53,18 @@ class Information(commands.Cog):
             color=discord.Color.blurple(),
         ).set_thumbnail(url=thumbnail_url)
 
-        # some statistics
-        total_members = 0
-        total_online = 0
-        offline = discord.Status.offline
-        for member in self.bot.get_all_members():
-            total_members += 1
-            if member.status is not offline:
-                total_online += 1
-
-        total_unique = len(self.bot.users)
+        # some statistics, the member cache is only complete when the guilds
+        # are chunked, and the statuses are only known with the presences intent
+        total_members = sum(guild.member_count or 0 for guild in self.bot.guilds)
+        members_info = [f"{int_fmt(total_members)} Total"]
+        if all(guild.chunked for guild in self.bot.guilds):
+            members_info.append(f"{int_fmt(len(self.bot.users))} Unique")
+        if self.bot.intents.presences:
+            offline = discord.Status.offline
+            total_online = sum(
+                member.status is not offline for member in self.bot.get_all_members()
+            )
+            members_info.append(f"{int_fmt(total_online)} Online")
 
         text_channels = 0
         voice_channels = 0
@@ -68,14 +75,7 @@ class Information(commands.Cog):
                 elif isinstance(channel, discord.VoiceChannel):
                     voice_channels += 1
 
-        embed.add_field(
-            name="Members",
-            value=(
-                f"{int_fmt(total_members)} Total\n"
-                f"{int_fmt(total_unique)} Unique\n"
-                f"{int_fmt(total_online)} Online"
-            ),
-        )
+        embed.add_field(name="Members", value="\n".join(members_info))
         embed.add_field(
             name="Channels",
             value=(
@@ -200,8 +200,9 @@ class Information(commands.Cog):
         if len(emoji_warning) != 0:
             warning_str = ", ".join(emoji_warning)
             LOGGER.warning(
-                "Some Application Emoji were not found, they will not show on profile: "
-                f"{warning_str}"
+                "Some Application Emoji were not found, "
+                "they will not show on profile: %s",
+                warning_str,
             )
             LOGGER.warning(
                 "Download the files at https://emoji.gg/pack/1834-profile-badges# "
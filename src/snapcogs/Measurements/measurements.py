@@ -1,15 +1,17 @@
 from __future__ import annotations
 
+import functools
 import logging
 import re
+import threading
 from typing import TYPE_CHECKING
 
 import discord
-import pint
 from discord import app_commands
 from discord.ext import commands
 
 if TYPE_CHECKING:
+    import pint
     from pint.facets.plain import PlainQuantity
 
     from ..bot import Bot
@@ -17,47 +19,81 @@ if TYPE_CHECKING:
 
 LOGGER = logging.getLogger(__name__)
 
+# the warm-up thread and the event loop can both ask for the UnitRegistry first
+_UNIT_REGISTRY_LOCK = threading.Lock()
 
-UREG = pint.UnitRegistry()
-UREG.default_system = None  # type: ignore[reportAttributeAccessIssue]
-UREG.formatter.default_format = ".3g~P"
-
-# define joke units
-UREG.define("banana = 178 millimeter")
-UREG.define("washing_machine = 70 * kilogram")
-
-
-METRIC = {
-    UREG.millimeter,
-    UREG.centimeter,
-    UREG.meter,
-    UREG.kilometer,
-    UREG.gram,
-    UREG.kilogram,
-    UREG.degree_Celsius,
-    UREG.banana,
-    UREG.washing_machine,
-}
-
-IMPERIAL = {
-    UREG.inch,
-    UREG.foot,
-    UREG.yard,
-    UREG.mile,
-    UREG.ounce,
-    UREG.pound,
-    UREG.degree_Fahrenheit,
-    UREG.banana,
-    UREG.washing_machine,
-}
-
-SYSTEMS = {
-    "mks": METRIC,
-    "imperial": IMPERIAL,
-}
-
-
-def _extract_units() -> list[str]:
+
+def get_unit_registry() -> pint.UnitRegistry:
+    """Return the UnitRegistry, creating it on first use.
+
+    Only one UnitRegistry is ever created, since units of different
+    registries cannot be combined.
+
+    Returns
+    -------
+    pint.UnitRegistry
+        The UnitRegistry, with the joke units defined.
+    """
+    with _UNIT_REGISTRY_LOCK:
+        return _create_unit_registry()
+
+
+@functools.cache
+def _create_unit_registry() -> pint.UnitRegistry:
+    import pint
+
+    ureg = pint.UnitRegistry()
+    ureg.default_system = None  # type: ignore[reportAttributeAccessIssue]
+    ureg.formatter.default_format = ".3g~P"
+
+    # define joke units
+    ureg.define("banana = 178 millimeter")
+    ureg.define("washing_machine = 70 * kilogram")
+
+    return ureg
+
+
+@functools.cache
+def get_unit_systems() -> dict[str, set[pint.Unit]]:
+    """Return the units of the metric and imperial systems.
+
+    Returns
+    -------
+    dict[str, set[pint.Unit]]
+        The units of each system, keyed by the system name in the UnitRegistry.
+    """
+    ureg = get_unit_registry()
+    metric = {
+        ureg.millimeter,
+        ureg.centimeter,
+        ureg.meter,
+        ureg.kilometer,
+        ureg.gram,
+        ureg.kilogram,
+        ureg.degree_Celsius,
+        ureg.banana,
+        ureg.washing_machine,
+    }
+    imperial = {
+        ureg.inch,
+        ureg.foot,
+        ureg.yard,
+        ureg.mile,
+        ureg.ounce,
+        ureg.pound,
+        ureg.degree_Fahrenheit,
+        ureg.banana,
+        ureg.washing_machine,
+    }
+
+    return {
+        "mks": metric,
+        "imperial": imperial,
+    }
+
+
+@functools.cache
+def get_units() -> list[str]:
     """Return a list of units from the UnitRegistry.
 
     Returns
@@ -65,10 +101,13 @@ def _extract_units() -> list[str]:
     list[str]
         The list of unit names from the UnitRegistry
     """
+    import pint
+
+    ureg = get_unit_registry()
     units: list[str] = []
-    for attr in dir(UREG):
+    for attr in dir(ureg):
         try:
-            if isinstance(getattr(UREG, attr), pint.Unit):
+            if isinstance(getattr(ureg, attr), pint.Unit):
                 units.append(attr)
 
         except pint.UndefinedUnitError:
@@ -77,9 +116,6 @@ def _extract_units() -> list[str]:
     return units
 
 
-UNITS = _extract_units()
-
-
 async def from_units_autocomplete(
     _: discord.Interaction, current: str
 ) -> list[app_commands.Choice[str]]:
@@ -97,7 +133,7 @@ async def from_units_autocomplete(
     list[app_commands.Choice[str]]
         The list of units that contain the current string input.
     """
-    choice_units = [u for u in UNITS if current.lower() in u.lower()][:25]
+    choice_units = [u for u in get_units() if current.lower() in u.lower()][:25]
     return [app_commands.Choice(name=unit, value=unit) for unit in choice_units]
 
 
@@ -120,10 +156,11 @@ async def to_units_autocomplete(
         The list of units with the same dimensions and contain the current string.
     """
     if from_ := interaction.namespace["from"]:
-        from_unit = getattr(UREG, from_)
+        ureg = get_unit_registry()
+        from_unit = getattr(ureg, from_)
         choice_units = [
             app_commands.Choice(name=str(unit), value=str(unit))
-            for unit in UREG.get_compatible_units(from_unit.dimensionality)
+            for unit in ureg.get_compatible_units(from_unit.dimensionality)
             if current.lower() in str(unit).lower()
         ][:25]
 
@@ -153,6 +190,7 @@ def find_quantities(text: str) -> list[PlainQuantity]:
     measurement_pattern = rf"(-?\d+(?:\.\d+)?)\s?(?:({metric_units}|{imperial_units}))"
 
     matches = re.findall(measurement_pattern, text)
+    ureg = get_unit_registry()
 
     # Combine matches and format them
     quantities: list[PlainQuantity] = []
@@ -172,7 +210,7 @@ def find_quantities(text: str) -> list[PlainQuantity]:
         elif unit == "'":
             unit = "feet"
 
-        quantities.append(UREG.Quantity(value, unit))
+        quantities.append(ureg.Quantity(value, unit))
 
     return quantities
 
@@ -200,10 +238,12 @@ def convert_to_other(measurement: PlainQuantity) -> list[PlainQuantity]:
         # handle temperature differently
         return [convert_to_other_temperature(measurement)]
 
-    if measurement.units in METRIC:
+    ureg = get_unit_registry()
+    systems = get_unit_systems()
+    if measurement.units in systems["mks"]:
         target_system = "imperial"
 
-    elif measurement.units in IMPERIAL:
+    elif measurement.units in systems["imperial"]:
         target_system = "mks"
 
     else:
@@ -211,16 +251,16 @@ def convert_to_other(measurement: PlainQuantity) -> list[PlainQuantity]:
         raise ValueError(msg)
 
     target_units = (
-        UREG.get_compatible_units(
+        ureg.get_compatible_units(
             measurement.dimensionality, group_or_system=target_system
         )
-        & SYSTEMS[target_system]
+        & systems[target_system]
     )
 
     # for _some reason_ the system wants to use grams instead
     # of the conventional kg, so we force it here
     return [
-        measurement.to(unit if unit != UREG.gram else UREG.kilogram)
+        measurement.to(unit if unit != ureg.gram else ureg.kilogram)
         for unit in target_units
     ]
 
@@ -243,11 +283,12 @@ def convert_to_other_temperature(measurement: PlainQuantity) -> PlainQuantity:
     ValueError
         Temperature units not Celsius or Fahrenheit.
     """
-    if measurement.units == UREG.degree_Celsius:
-        return measurement.to(UREG.degree_Fahrenheit)
+    ureg = get_unit_registry()
+    if measurement.units == ureg.degree_Celsius:
+        return measurement.to(ureg.degree_Fahrenheit)
 
-    if measurement.units == UREG.degree_Fahrenheit:
-        return measurement.to(UREG.degree_Celsius)
+    if measurement.units == ureg.degree_Fahrenheit:
+        return measurement.to(ureg.degree_Celsius)
 
     msg = f"Wrong temperature unit {measurement.units}."
     raise ValueError(msg)
@@ -263,6 +304,12 @@ class Measurements(commands.Cog):
         )
         self.bot.tree.add_command(self.convert_units_context_menu)
 
+    def warm_up(self) -> None:
+        """Build the UnitRegistry and the units tables ahead of their first use."""
+
+        get_units()
+        get_unit_systems()
+
     @app_commands.command()
     @app_commands.rename(from_="from")
     @app_commands.describe(
@@ -280,7 +327,7 @@ class Measurements(commands.Cog):
     ) -> None:
         """Convert a value from one unit to another."""
 
-        quantity = UREG.Quantity(value, from_)
+        quantity = get_unit_registry().Quantity(value, from_)
 
         await interaction.response.send_message(
             f"You converted `{quantity}` to `{quantity.to(to):.3g}`", ephemeral=True
@@ -293,7 +340,7 @@ class Measurements(commands.Cog):
 
         quantities = find_quantities(message.content)
 
-        LOGGER.debug(f"Found {len(quantities)} quantities: {quantities}")
+        LOGGER.debug("Found %s quantities: %s", len(quantities), quantities)
 
         embed = discord.Embed(
             colour=discord.Colour.blurple(),
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import logging
+from collections import Counter, deque
+from typing import TYPE_CHECKING, Any
+
+import discord
+from sqlalchemy import insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from . import models
+
+if TYPE_CHECKING:
+    import datetime
+    from collections.abc import Iterable
+
+    from ..database import Database
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RolesEvents:
+    """Buffer of the roles added and removed through the roles menus.
+
+    Recording an event only appends it to a bounded in-memory buffer. The buffer
+    is written to the database in batches by flush(), which also updates the
+    daily picks rollup so statistics never scan the raw events.
+    """
+
+    def __init__(self, maxlen: int = 10_000) -> None:
+        self._buffer: deque[dict[str, Any]] = deque(maxlen=maxlen)
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def record(
+        self,
+        member: discord.Member,
+        *,
+        added: Iterable[discord.Role] = (),
+        removed: Iterable[discord.Role] = (),
+    ) -> None:
+        """Record the roles added to and removed from the member."""
+
+        now = discord.utils.utcnow()
+        for roles, is_added in ((added, True), (removed, False)):
+            for role in roles:
+                if len(self._buffer) == self._buffer.maxlen:
+                    # the oldest event is discarded by the deque
+                    self.dropped += 1
+
+                self._buffer.append(
+                    {
+                        "added": is_added,
+                        "created_at": now,
+                        "guild_id": member.guild.id,
+                        "role_id": role.id,
+                        "user_id": member.id,
+                    }
+                )
+
+    async def flush(self, db: Database) -> int:
+        """Write the buffered events and update the rollup, in one transaction.
+
+        Return the number of events written. If the write fails, the events
+        are put back in the buffer, before the ones recorded meanwhile.
+        """
+
+        events = list(self._buffer)
+        self._buffer.clear()
+        if not events:
+            return 0
+
+        added: Counter[tuple[int, int, datetime.date]] = Counter()
+        removed: Counter[tuple[int, int, datetime.date]] = Counter()
+        for event in events:
+            key = (event["guild_id"], event["role_id"], event["created_at"].date())
+            (added if event["added"] else removed)[key] += 1
+
+        daily_picks = [
+            {
+                "guild_id": guild_id,
+                "role_id": role_id,
+                "day": day,
+                "added": added[guild_id, role_id, day],
+                "removed": removed[guild_id, role_id, day],
+            }
+            for guild_id, role_id, day in added.keys() | removed.keys()
+        ]
+        upsert = sqlite_insert(models.DailyPicks)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=["guild_id", "role_id", "day"],
+            set_={
+                "added": models.DailyPicks.added + upsert.excluded.added,
+                "removed": models.DailyPicks.removed + upsert.excluded.removed,
+            },
+        )
+
+        try:
+            async with db.session() as session, session.begin():
+                await session.execute(insert(models.Event), events)
+                await session.execute(upsert, daily_picks)
+        except BaseException:
+            self._requeue(events)
+            raise
+
+        LOGGER.debug("Flushed %s roles events", len(events))
+        return len(events)
+
+    def _requeue(self, events: list[dict[str, Any]]) -> None:
+        """Put back events that could not be written, before the newer ones."""
+
+        newer = list(self._buffer)
+        self._buffer.clear()
+        # the deque discards the oldest events if they no longer fit
+        self._buffer.extend(events)
+        self._buffer.extend(newer)
+
+        assert self._buffer.maxlen is not None
+        self.dropped += max(len(events) + len(newer) - self._buffer.maxlen, 0)
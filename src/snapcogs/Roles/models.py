@@ -1,4 +1,7 @@
-from sqlalchemy import ForeignKey
+import datetime
+from dataclasses import dataclass
+
+from sqlalchemy import ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..database import Base
@@ -8,6 +11,8 @@ class View(Base):
     __tablename__ = "roles_view"
 
     guild_id: Mapped[int]
+    # None for the Views saved before it was stored, until their menu is used
+    channel_id: Mapped[int | None]
     message_id: Mapped[int] = mapped_column(unique=True)
     toggle: Mapped[bool]
     components: Mapped[list["Component"]] = relationship(cascade="all, delete-orphan")
@@ -27,3 +32,31 @@ class Role(Base):
 
     role_id: Mapped[int]
     view_id: Mapped[int] = mapped_column(ForeignKey(View.id))
+
+
+class Event(Base):
+    __tablename__ = "roles_event"
+
+    added: Mapped[bool]
+    created_at: Mapped[datetime.datetime]
+    guild_id: Mapped[int]
+    role_id: Mapped[int]
+    user_id: Mapped[int]
+
+
+class DailyPicks(Base):
+    __tablename__ = "roles_daily_picks"
+    __table_args__ = (UniqueConstraint("guild_id", "role_id", "day"),)
+
+    added: Mapped[int] = mapped_column(default=0)
+    day: Mapped[datetime.date]
+    guild_id: Mapped[int]
+    removed: Mapped[int] = mapped_column(default=0)
+    role_id: Mapped[int]
+
+
+@dataclass
+class RolePicks:
+    role_id: int
+    added: int = 0
+    removed: int = 0
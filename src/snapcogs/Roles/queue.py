@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from asyncio import Future, Task
+    from collections.abc import Callable, Coroutine, Iterable
+    from typing import Any
+
+    import discord
+
+    from .events import RolesEvents
+
+    type Spawn = Callable[[Coroutine[Any, Any, None]], Task]
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RolesQueueClosed(RuntimeError):
+    """The roles queue was closed, when the cog was unloaded."""
+
+
+@dataclass
+class RolesEdit:
+    """Pending roles edit of a member, merged with the requests made meanwhile."""
+
+    member: discord.Member
+    added: set[discord.Role]
+    removed: set[discord.Role]
+    enqueued_at: float = field(default_factory=time.monotonic)
+    waiters: list[Future[None]] = field(default_factory=list)
+
+    def merge(self, added: set[discord.Role], removed: set[discord.Role]) -> None:
+        """Merge a newer edit, which takes precedence over this one."""
+
+        self.added = (self.added - removed) | added
+        self.removed = (self.removed - added) | removed
+
+
+@dataclass
+class QueueStats:
+    depth: int = 0
+    processed: int = 0
+    coalesced: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def average_wait(self) -> float:
+        return self.total_wait / self.processed if self.processed else 0.0
+
+
+class RolesQueue:
+    """Per guild queue of the roles edits requested through the roles menus.
+
+    Edits for the same member are coalesced while they wait, and each guild's
+    queue is drained one edit at a time. Member edits share a rate limit bucket
+    per guild, so discord.py's rate limiter paces the drain to the budget
+    returned by Discord instead of letting the requests pile up.
+    """
+
+    def __init__(
+        self, events: RolesEvents | None = None, *, spawn: Spawn = asyncio.create_task
+    ) -> None:
+        self.events = events
+        self._spawn = spawn
+        self._pending: dict[int, dict[int, RolesEdit]] = {}
+        self._workers: dict[int, Task] = {}
+        self._stats = QueueStats()
+        self._closed = False
+
+    @property
+    def stats(self) -> QueueStats:
+        """Current depth and wait time statistics of the queue."""
+
+        self._stats.depth = self.depth()
+        return self._stats
+
+    def depth(self, guild: discord.abc.Snowflake | None = None) -> int:
+        """Number of members waiting for an edit, in total or for the guild."""
+
+        if guild is not None:
+            return len(self._pending.get(guild.id, {}))
+
+        return sum(len(pending) for pending in self._pending.values())
+
+    def enqueue(
+        self,
+        member: discord.Member,
+        *,
+        added: Iterable[discord.Role] = (),
+        removed: Iterable[discord.Role] = (),
+    ) -> Future[None]:
+        """Queue a roles edit for the member.
+
+        The returned future is done once the roles are edited. Raise
+        RolesQueueClosed if the queue is closed.
+        """
+
+        if self._closed:
+            msg = "The roles queue is closed"
+            raise RolesQueueClosed(msg)
+
+        waiter = asyncio.get_running_loop().create_future()
+        guild_id = member.guild.id
+        pending = self._pending.setdefault(guild_id, {})
+
+        edit = pending.get(member.id)
+        if edit is None:
+            edit = RolesEdit(member, set(added), set(removed))
+            pending[member.id] = edit
+        else:
+            edit.member = member
+            edit.merge(set(added), set(removed))
+            self._stats.coalesced += 1
+
+        edit.waiters.append(waiter)
+
+        if guild_id not in self._workers:
+            self._workers[guild_id] = self._spawn(self._drain(guild_id))
+
+        return waiter
+
+    def close(self) -> None:
+        """Cancel the pending edits and stop the workers. The edits waited
+        for, and the ones queued afterwards, fail with RolesQueueClosed.
+        """
+
+        self._closed = True
+        for worker in self._workers.values():
+            worker.cancel()
+
+        for pending in self._pending.values():
+            for edit in pending.values():
+                self._fail_closed(edit)
+
+        self._pending.clear()
+
+    @staticmethod
+    def _fail_closed(edit: RolesEdit) -> None:
+        for waiter in edit.waiters:
+            if not waiter.done():
+                waiter.set_exception(RolesQueueClosed("The roles queue is closed"))
+
+    async def _drain(self, guild_id: int) -> None:
+        """Apply the pending edits of the guild, in order."""
+
+        pending = self._pending[guild_id]
+        try:
+            while pending:
+                member_id = next(iter(pending))
+                edit = pending.pop(member_id)
+                try:
+                    await self._apply(edit)
+                except asyncio.CancelledError:
+                    # closed while editing, the members are waiting for it
+                    self._fail_closed(edit)
+                    raise
+                except Exception as e:
+                    LOGGER.exception("Could not edit the roles of %s", edit.member)
+                    # the waiters report the failure to the members
+                    for waiter in edit.waiters:
+                        if not waiter.done():
+                            waiter.set_exception(e)
+                else:
+                    for waiter in edit.waiters:
+                        if not waiter.done():
+                            waiter.set_result(None)
+                finally:
+                    self._record_wait(time.monotonic() - edit.enqueued_at)
+
+        finally:
+            del self._workers[guild_id]
+            if not pending:
+                self._pending.pop(guild_id, None)
+
+    async def _apply(self, edit: RolesEdit) -> None:
+        """Edit the member's roles in a single request, if anything changed."""
+
+        # use the latest roles from the cache, they might have changed while waiting
+        member = edit.member.guild.get_member(edit.member.id) or edit.member
+        current_roles = set(member.roles[1:])  # skip @everyone
+        new_roles = (current_roles - edit.removed) | edit.added
+
+        if new_roles != current_roles:
+            LOGGER.debug(
+                "Editing roles of %s, +%s -%s",
+                member,
+                len(new_roles - current_roles),
+                len(current_roles - new_roles),
+            )
+            await member.edit(roles=sorted(new_roles))
+
+            if self.events is not None:
+                self.events.record(
+                    member,
+                    added=new_roles - current_roles,
+                    removed=current_roles - new_roles,
+                )
+
+    def _record_wait(self, wait: float) -> None:
+        self._stats.processed += 1
+        self._stats.total_wait += wait
+        self._stats.max_wait = max(self._stats.max_wait, wait)
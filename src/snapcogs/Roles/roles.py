@@ -1,23 +1,32 @@
 from __future__ import annotations
 
+import datetime
 import logging
+from itertools import batched
 from typing import TYPE_CHECKING
 
 import discord
 from discord import app_commands
-from discord.ext import commands
-from sqlalchemy import select
+from discord.ext import commands, tasks
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from ..cache import CacheNeeds
 from ..utils.errors import TransformerMessageNotFound, TransformerNotBotMessage
 from ..utils.transformers import BotMessageTransformer  # noqa: TC001
 from . import models, views
+from .events import RolesEvents
+from .queue import RolesQueue
 
 if TYPE_CHECKING:
     from ..bot import Bot
 
 LOGGER = logging.getLogger(__name__)
 
+# number of views deleted per transaction
+DELETE_BATCH_SIZE = 100
+
 
 class Roles(commands.Cog):
     roles = app_commands.Group(
@@ -25,10 +34,33 @@ class Roles(commands.Cog):
         description="Create a roles selection menu",
         default_permissions=discord.Permissions(manage_roles=True),
     )
+    cache_needs = CacheNeeds(
+        intents=discord.Intents(members=True),
+        fallback=(
+            "the roles edits start from the member's roles when they used the "
+            "menu, and undo the changes made to them while the edit was queued"
+        ),
+    )
 
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
         self.persistent_views_loaded = False
+        self.events = RolesEvents()
+        self.queue = RolesQueue(self.events, spawn=bot.supervisor.spawn)
+        # View models by message ID, kept up to date by the methods writing to the DB
+        self._views: dict[int, models.View] = {}
+        # Views listening to the menus' interactions, by message ID
+        self._listening_views: dict[int, views.RolesView] = {}
+
+    async def cog_load(self) -> None:
+        self.cleanup_views.start()
+        self.flush_events.start()
+
+    async def cog_unload(self) -> None:
+        self.cleanup_views.cancel()
+        self.queue.close()
+        self.flush_events.cancel()
+        await self.events.flush(self.bot.db)
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
@@ -44,10 +76,152 @@ class Roles(commands.Cog):
         for view_model in await self._get_all_views():
             view = await self.build_view(view_model)
             if view is not None:
-                self.bot.add_view(
-                    view,
-                    message_id=view_model.message_id,
-                )
+                self._listen(view, view_model.message_id)
+
+    @tasks.loop(hours=24)
+    async def cleanup_views(self) -> None:
+        """Delete the Views of guilds the bot left, with none of their roles
+        left, or whose message was deleted.
+
+        Views of deleted messages are removed as the messages are deleted,
+        in the on_raw_message_delete listener. The messages deleted while the
+        bot was offline are found by fetching them.
+        """
+
+        orphaned_views = [
+            view_model
+            for view_model in await self._get_all_views()
+            if self._is_orphaned(view_model) or await self._is_deleted(view_model)
+        ]
+        LOGGER.info("Found %s orphaned roles selection menus", len(orphaned_views))
+
+        if orphaned_views:
+            await self._delete_views(orphaned_views)
+
+    @cleanup_views.before_loop
+    async def cleanup_views_before(self) -> None:
+        await self.bot.wait_until_ready()
+
+    @tasks.loop(minutes=1)
+    async def flush_events(self) -> None:
+        """Save the recorded roles events to the database."""
+
+        try:
+            await self.events.flush(self.bot.db)
+        except Exception:
+            # the events are kept in the buffer for the next flush
+            LOGGER.exception("Could not save %s roles events", len(self.events))
+
+    def _is_orphaned(self, view_model: models.View) -> bool:
+        """Check if the View's guild or all of its roles are gone."""
+
+        if not self.bot.owns_guild(view_model.guild_id):
+            # the guild is not in cache because another process handles it
+            return False
+
+        guild = self.bot.get_guild(view_model.guild_id)
+        if guild is None:
+            return True
+
+        if guild.unavailable:
+            # roles are unknown during an outage, so keep the View
+            return False
+
+        return all(guild.get_role(role.role_id) is None for role in view_model.roles)
+
+    async def _is_deleted(self, view_model: models.View) -> bool:
+        """Check if the View's message or its channel were deleted."""
+
+        if view_model.channel_id is None:
+            return False
+
+        message = self.bot.get_partial_messageable(
+            view_model.channel_id
+        ).get_partial_message(view_model.message_id)
+        try:
+            await message.fetch()
+        except discord.NotFound:
+            return True
+        except discord.HTTPException:
+            # missing access, or an outage, so keep the View
+            LOGGER.debug("Could not fetch roles selection menu %s", message.id)
+
+        return False
+
+    @commands.Cog.listener()
+    async def on_interaction(self, interaction: discord.Interaction) -> None:
+        """Store the channel of the Views saved before it was stored."""
+
+        if interaction.message is None or interaction.channel_id is None:
+            return
+
+        view_model = self._views.get(interaction.message.id)
+        if view_model is not None and view_model.channel_id is None:
+            await self._save_channel(view_model, interaction.channel_id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(
+        self, payload: discord.RawMessageDeleteEvent
+    ) -> None:
+        """Delete the View of a deleted roles selection menu."""
+
+        view_model = self._views.get(payload.message_id)
+        if view_model is not None:
+            LOGGER.debug("Roles selection menu %s was deleted", payload.message_id)
+            await self._delete_views([view_model])
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(
+        self, payload: discord.RawBulkMessageDeleteEvent
+    ) -> None:
+        """Delete the Views of deleted roles selection menus."""
+
+        view_models = [
+            view_model
+            for message_id in payload.message_ids
+            if (view_model := self._views.get(message_id)) is not None
+        ]
+        if view_models:
+            await self._delete_views(view_models)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        """Remove a deleted role from the Views, or delete them if it was the last."""
+
+        view_models = [
+            view_model
+            for view_model in self._views.values()
+            if view_model.guild_id == role.guild.id
+            and any(r.role_id == role.id for r in view_model.roles)
+        ]
+
+        orphaned_views = []
+        for view_model in view_models:
+            if self._is_orphaned(view_model):
+                orphaned_views.append(view_model)
+                continue
+
+            await self._delete_roles(view_model, {role.id})
+            # replace the registered View so the deleted role is not selectable
+            view = await self.build_view(view_model)
+            if view is not None:
+                self._listen(view, view_model.message_id)
+
+        if orphaned_views:
+            await self._delete_views(orphaned_views)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        """Delete the Views of the guild the bot left."""
+
+        view_models = [
+            view_model
+            for view_model in self._views.values()
+            if view_model.guild_id == guild.id
+        ]
+        if view_models:
+            LOGGER.debug("Deleting %s Views from guild %s", len(view_models), guild.id)
+            await self._delete_views(view_models)
 
     async def save_persistent_view(
         self, view: views.RolesView, message: discord.Message
@@ -58,6 +232,7 @@ class Roles(commands.Cog):
 
         roles_view_model = models.View(
             guild_id=message.guild.id,
+            channel_id=message.channel.id,
             message_id=message.id,
             toggle=view.toggle,
         )
@@ -100,7 +275,21 @@ class Roles(commands.Cog):
 
         toggle = view_model.toggle
 
-        return views.RolesView(roles, toggle=toggle, components_id=components_id)
+        return views.RolesView(
+            roles, queue=self.queue, toggle=toggle, components_id=components_id
+        )
+
+    def _listen(self, view: views.RolesView, message_id: int) -> None:
+        """Listen to the interactions of the menu with the View, instead of the
+        View it had before.
+        """
+
+        previous = self._listening_views.pop(message_id, None)
+        if previous is not None and previous is not view:
+            previous.stop()
+
+        self.bot.add_view(view, message_id=message_id)
+        self._listening_views[message_id] = view
 
     async def roles_creation_selection(
         self,
@@ -155,8 +344,9 @@ class Roles(commands.Cog):
 
         selected_roles = await self.roles_creation_selection(interaction)
 
-        view = views.RolesView(selected_roles, toggle=toggle)
+        view = views.RolesView(selected_roles, queue=self.queue, toggle=toggle)
         message = await channel.send(content=content, view=view)
+        self._listen(view, message.id)
         await self.save_persistent_view(view, message)
 
     @roles.command(name="select")
@@ -217,10 +407,10 @@ class Roles(commands.Cog):
         view_model.roles.extend([models.Role(role_id=r.id) for r in added_roles])
         await self._save_view(view_model)
 
-        # update view model with added roles
-        view_model = await self._get_view_from_message(message)
-
-        await message.edit(view=await self.build_view(view_model))
+        view = await self.build_view(view_model)
+        await message.edit(view=view)
+        if view is not None:
+            self._listen(view, message.id)
 
         roles_str = ", ".join(role.mention for role in added_roles)
         embed = discord.Embed(
@@ -255,15 +445,12 @@ class Roles(commands.Cog):
             interaction, available_roles=current_selection_roles
         )
 
-        removed_role_models = [
-            r for r in view_model.roles if r.role_id in [rr.id for rr in removed_roles]
-        ]
-        await self._delete_roles(removed_role_models)
-
-        # update view model without removed roles
-        view_model = await self._get_view_from_message(message)
+        await self._delete_roles(view_model, {r.id for r in removed_roles})
 
-        await message.edit(view=await self.build_view(view_model))
+        view = await self.build_view(view_model)
+        await message.edit(view=view)
+        if view is not None:
+            self._listen(view, message.id)
 
         roles_str = ", ".join(role.mention for role in removed_roles)
         embed = discord.Embed(
@@ -328,6 +515,30 @@ class Roles(commands.Cog):
 
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
+    @roles.command(name="stats")
+    @app_commands.describe(days="Number of days to count the picks for.")
+    async def roles_stats(
+        self,
+        interaction: discord.Interaction,
+        days: app_commands.Range[int, 1, 365] = 30,
+    ) -> None:
+        """Show how many times the roles were picked from the selection menus."""
+
+        assert interaction.guild is not None
+        daily_picks = await self._get_guild_picks(interaction.guild, days)
+
+        embed = discord.Embed(
+            color=discord.Color.blurple(),
+            title="Roles Selection Statistics",
+            description="\n".join(
+                f"<@&{picks.role_id}>: {picks.added} added, {picks.removed} removed"
+                for picks in daily_picks
+            )
+            or "No roles were picked.",
+        ).set_footer(text=f"Statistics for the last {days} days")
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     @roles_add.error
     @roles_remove.error
     @roles_edit.error
@@ -354,7 +565,10 @@ class Roles(commands.Cog):
             interaction.extras["error_handled"] = False
 
     async def _get_all_views(self) -> list[models.View]:
-        """Select all registered Views from the database."""
+        """Select the registered Views of the guilds on the bot's shards from
+        the database, so processes running different shards leave each other's
+        Views alone.
+        """
 
         async with self.bot.db.session() as session:
             roles_view_models = await session.scalars(
@@ -364,11 +578,48 @@ class Roles(commands.Cog):
                 )
             )
 
-        return list(roles_view_models.unique())
+        view_models = [
+            view_model
+            for view_model in roles_view_models.unique()
+            if self.bot.owns_guild(view_model.guild_id)
+        ]
+        self._views = {view_model.message_id: view_model for view_model in view_models}
+
+        return view_models
+
+    async def _get_guild_picks(
+        self, guild: discord.Guild, days: int
+    ) -> list[models.RolePicks]:
+        """Get the total picks per role of the guild over the last days."""
+
+        since = discord.utils.utcnow().date() - datetime.timedelta(days=days - 1)
+        async with self.bot.db.session() as session:
+            results = await session.execute(
+                select(
+                    models.DailyPicks.role_id,
+                    func.sum(models.DailyPicks.added),
+                    func.sum(models.DailyPicks.removed),
+                )
+                .where(
+                    models.DailyPicks.guild_id == guild.id,
+                    models.DailyPicks.day >= since,
+                )
+                .group_by(models.DailyPicks.role_id)
+                .order_by(func.sum(models.DailyPicks.added).desc())
+            )
+
+        return [
+            models.RolePicks(role_id=result[0], added=result[1], removed=result[2])
+            for result in results
+        ]
 
     async def _get_view_from_message(self, message: discord.Message) -> models.View:
         """Get the View data associated with a Message."""
 
+        view_model = self._views.get(message.id)
+        if view_model is not None:
+            return view_model
+
         async with self.bot.db.session() as session:
             view_model = await session.scalar(
                 select(models.View)
@@ -383,6 +634,8 @@ class Roles(commands.Cog):
             msg = "There is no view associated with the message."
             raise ValueError(msg)
 
+        self._views[message.id] = view_model
+
         return view_model
 
     async def _save_view(self, role_view: models.View) -> None:
@@ -391,20 +644,69 @@ class Roles(commands.Cog):
         async with self.bot.db.session() as session, session.begin():
             session.add(role_view)
 
-    async def _delete_roles(self, role_models: list[models.Role]) -> None:
-        """Delete roles information from the Database."""
+        self._views[role_view.message_id] = role_view
+
+    async def _save_channel(self, view_model: models.View, channel_id: int) -> None:
+        """Save the channel of the View's message."""
 
         async with self.bot.db.session() as session, session.begin():
-            for role in role_models:
-                await session.delete(role)
+            await session.execute(
+                update(models.View)
+                .where(models.View.id == view_model.id)
+                .values(channel_id=channel_id)
+            )
 
-    async def _delete_view_from_message(self, message: discord.Message) -> None:
-        """Delete the view and all the referencing rows in the other tables."""
+        set_committed_value(view_model, "channel_id", channel_id)
+
+    async def _delete_roles(self, view_model: models.View, role_ids: set[int]) -> None:
+        """Delete roles information of the View from the Database."""
 
-        # delete should cascade
         async with self.bot.db.session() as session, session.begin():
-            view_model = await session.scalar(
-                select(models.View).where(models.View.message_id == message.id)
+            await session.execute(
+                delete(models.Role).where(
+                    models.Role.view_id == view_model.id,
+                    models.Role.role_id.in_(role_ids),
+                )
             )
 
-            await session.delete(view_model)
+        # the roles are already deleted, so do not record this as a change
+        set_committed_value(
+            view_model,
+            "roles",
+            [role for role in view_model.roles if role.role_id not in role_ids],
+        )
+        self._views[view_model.message_id] = view_model
+
+    async def _delete_views(self, view_models: list[models.View]) -> None:
+        """Delete the Views and all the referencing rows in the other tables,
+        in batched transactions.
+        """
+
+        for view_models_batch in batched(view_models, DELETE_BATCH_SIZE):
+            view_ids = [view_model.id for view_model in view_models_batch]
+            async with self.bot.db.session() as session, session.begin():
+                await session.execute(
+                    delete(models.Component).where(
+                        models.Component.view_id.in_(view_ids)
+                    )
+                )
+                await session.execute(
+                    delete(models.Role).where(models.Role.view_id.in_(view_ids))
+                )
+                await session.execute(
+                    delete(models.View).where(models.View.id.in_(view_ids))
+                )
+
+            for view_model in view_models_batch:
+                self._views.pop(view_model.message_id, None)
+                # stop listening to the menu's interactions
+                view = self._listening_views.pop(view_model.message_id, None)
+                if view is not None:
+                    view.stop()
+
+        LOGGER.debug("Deleted %s Views", len(view_models))
+
+    async def _delete_view_from_message(self, message: discord.Message) -> None:
+        """Delete the view and all the referencing rows in the other tables."""
+
+        await self._delete_views([await self._get_view_from_message(message)])
@@ -8,9 +8,13 @@ import discord
 from discord import ButtonStyle, Color
 from discord.ui import Button, Item, Select, View
 
+from .queue import RolesQueueClosed
+
 if TYPE_CHECKING:
     from collections.abc import Iterable
 
+    from .queue import RolesQueue
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -18,8 +22,10 @@ class RolesCreateSelect(Select):
     """Select menu to select which roles will be available to select in the message."""
 
     def __init__(self, roles: list[discord.Role]) -> None:
-        options = [discord.SelectOption(label=role.name) for role in roles]
-        self._roles = roles
+        options = [
+            discord.SelectOption(label=role.name, value=str(role.id)) for role in roles
+        ]
+        self._roles = {str(role.id): role for role in roles}
         self.view: RolesCreateView
         super().__init__(
             placeholder="Select roles from the available list.",
@@ -28,11 +34,8 @@ class RolesCreateSelect(Select):
         )
 
     async def callback(self, interaction: discord.Interaction) -> None:
-        selected_roles = [
-            discord.utils.get(self._roles, name=value) for value in self.values
-        ]
         self.view.selected_roles = sorted(
-            [r for r in selected_roles if r is not None],
+            [self._roles[value] for value in self.values],
             reverse=True,
         )
         await interaction.response.defer()
@@ -63,8 +66,11 @@ class RolesSelect(Select):
         self, roles: Iterable[discord.Role], *, toggle: bool, custom_id: str
     ) -> None:
         roles = sorted(roles, reverse=True)
-        options = [discord.SelectOption(label=role.name) for role in roles]
-        self._roles = roles
+        options = [
+            discord.SelectOption(label=role.name, value=str(role.id)) for role in roles
+        ]
+        self._roles = {str(role.id): role for role in roles}
+        self.view: RolesView
         super().__init__(
             placeholder="Select roles",
             options=options,
@@ -72,6 +78,16 @@ class RolesSelect(Select):
             custom_id=custom_id,
         )
 
+    def _get_role(self, value: str) -> discord.Role | None:
+        """Get the role of the selected option value."""
+
+        role = self._roles.get(value)
+        if role is None:
+            # menus sent before the options were keyed by role ID use the name
+            role = discord.utils.get(self._roles.values(), name=value)
+
+        return role
+
     async def callback(self, interaction: discord.Interaction) -> None:
         """Edit the roles of the member, removing unselected roles
         and adding the selected ones
@@ -79,36 +95,29 @@ class RolesSelect(Select):
 
         member = interaction.user
         assert isinstance(member, discord.Member)
+        await interaction.response.defer(ephemeral=True, thinking=True)
 
-        selected_roles = [
-            discord.utils.get(self._roles, name=value) for value in self.values
-        ]
-        selected_roles = [r for r in selected_roles if r is not None]
-        added_roles = [role for role in selected_roles if role not in member.roles]
-        removed_roles = [
-            role
-            for role in self._roles
-            if (role in member.roles) and (role not in selected_roles)
-        ]
-
-        if removed_roles:
+        selected_roles = {
+            role for value in self.values if (role := self._get_role(value)) is not None
+        }
+        removed_roles = set(self._roles.values()) - selected_roles
+        if LOGGER.isEnabledFor(logging.DEBUG):
             LOGGER.debug(
-                f"Removing roles {', '.join([str(r) for r in removed_roles])} "
-                f"to {member}"
+                "Setting roles %s for %s",
+                ", ".join(r.name for r in selected_roles),
+                member,
             )
-            await member.remove_roles(*removed_roles)
-
-        if added_roles:
-            added_roles_str = ", ".join([r.name for r in added_roles])
-            LOGGER.debug(f"Adding roles {added_roles_str} to {member}")
-            await member.add_roles(*added_roles)
+        if not await self.view.edit_roles(
+            interaction, member, added=selected_roles, removed=removed_roles
+        ):
+            return
 
-        await interaction.response.send_message(
+        selected_roles_str = ", ".join(
+            r.name for r in sorted(selected_roles, reverse=True)
+        )
+        await interaction.followup.send(
             embed=discord.Embed(
-                title=(
-                    "Setting your roles to "
-                    f"{', '.join(r.name for r in selected_roles)}."
-                ),
+                title=f"Setting your roles to {selected_roles_str}.",
                 color=Color.green(),
             ),
             ephemeral=True,
@@ -122,6 +131,7 @@ class RolesView(View):
         self,
         roles: Iterable[discord.Role],
         *,
+        queue: RolesQueue,
         toggle: bool = False,
         components_id: dict[str, str] | None = None,
     ) -> None:
@@ -132,6 +142,7 @@ class RolesView(View):
                 "select": token_hex(16),
                 "clear": token_hex(16),
             }
+        self.queue = queue
         self.toggle = toggle
         self.components_id = components_id
         self.roles = roles
@@ -154,14 +165,13 @@ class RolesView(View):
 
         member = interaction.user
         assert isinstance(member, discord.Member)
-        removed_roles = [r for r in self.roles if r in member.roles]
+        await interaction.response.defer(ephemeral=True, thinking=True)
 
-        if removed_roles:
-            removed_roles_str = ", ".join(r.name for r in removed_roles)
-            LOGGER.debug(f"Removing roles {removed_roles_str} from {interaction.user}")
-            await member.remove_roles(*removed_roles)
+        LOGGER.debug("Clearing roles from %s", member)
+        if not await self.edit_roles(interaction, member, removed=self.roles):
+            return
 
-        await interaction.response.send_message(
+        await interaction.followup.send(
             embed=discord.Embed(
                 title=("Cleared your roles."),
                 color=Color.green(),
@@ -169,16 +179,55 @@ class RolesView(View):
             ephemeral=True,
         )
 
-    async def on_error(
-        self, interaction: discord.Interaction, error: Exception, _: Item
-    ) -> None:
-        if isinstance(error, KeyError):
-            await interaction.response.send_message(
+    async def edit_roles(
+        self,
+        interaction: discord.Interaction,
+        member: discord.Member,
+        *,
+        added: Iterable[discord.Role] = (),
+        removed: Iterable[discord.Role] = (),
+    ) -> bool:
+        """Queue the roles edit of the member and wait for it.
+
+        Return whether the roles were edited. If not, the failure is reported
+        to the member in a followup to the deferred interaction.
+        """
+
+        try:
+            await self.queue.enqueue(member, added=added, removed=removed)
+        except (discord.HTTPException, RolesQueueClosed):
+            # already logged by the queue, or the cog is being unloaded
+            await interaction.followup.send(
                 embed=discord.Embed(
-                    title="There was an error, you need to select at least one role.",
+                    title="Could not edit your roles, please try again later.",
                     color=Color.red(),
                 ),
                 ephemeral=True,
             )
+            return False
+
+        return True
+
+    async def on_error(
+        self, interaction: discord.Interaction, error: Exception, _: Item
+    ) -> None:
+        if isinstance(error, KeyError):
+            embed = discord.Embed(
+                title="There was an error, you need to select at least one role.",
+                color=Color.red(),
+            )
+            if interaction.response.is_done():
+                await interaction.followup.send(embed=embed, ephemeral=True)
+            else:
+                await interaction.response.send_message(embed=embed, ephemeral=True)
         else:
+            if interaction.response.is_done():
+                # answer the deferred response, which would keep "thinking"
+                await interaction.followup.send(
+                    embed=discord.Embed(
+                        title="There was an error, please try again later.",
+                        color=Color.red(),
+                    ),
+                    ephemeral=True,
+                )
             raise error
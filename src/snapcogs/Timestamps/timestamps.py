@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import itertools
 import typing
 from collections import defaultdict
@@ -7,16 +8,12 @@ from datetime import datetime  # noqa: TC003
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import discord
-from dateutil.parser import ParserError, parse
 from discord import app_commands
 from discord.ext import commands
 
-from .timezones import abbrevs_pytz
-
 if typing.TYPE_CHECKING:
     from ..bot import Bot
-
-TZ_DATA = abbrevs_pytz()
+    from .timezones import TZChoice
 
 _STYLES = {
     "t": "Short Time",
@@ -31,6 +28,15 @@ _STYLES = {
 TIMESTAMP_STYLE = [app_commands.Choice(name=v, value=k) for k, v in _STYLES.items()]
 
 
+@functools.cache
+def get_tz_data() -> dict[str, set[TZChoice]]:
+    """Return the time zones of each abbreviation, walking pytz on first use."""
+
+    from .timezones import abbrevs_pytz
+
+    return abbrevs_pytz()
+
+
 class DatetimeTransformerError(app_commands.AppCommandError):
     pass
 
@@ -48,6 +54,8 @@ class DatetimeTransformer(app_commands.Transformer):
     async def transform(
         self, interaction: discord.Interaction, value: str, /
     ) -> datetime:
+        from dateutil.parser import ParserError, parse
+
         try:
             dt = parse(timestr=value, fuzzy=True, ignoretz=True)
             self.cache[interaction.user.id] = dt
@@ -79,9 +87,10 @@ class TimezoneTransformer(app_commands.Transformer):
     async def autocomplete(  # type: ignore[reportIncompatibleMethodOverride]
         self, _: discord.Interaction, value: str, /
     ) -> list[app_commands.Choice[str]]:
-        possible_abbrevs = [abbrev for abbrev in TZ_DATA if value.upper() in abbrev]
+        tz_data = get_tz_data()
+        possible_abbrevs = [abbrev for abbrev in tz_data if value.upper() in abbrev]
         possible_tz = list(
-            itertools.chain(*[TZ_DATA[abbrev] for abbrev in possible_abbrevs])
+            itertools.chain(*[tz_data[abbrev] for abbrev in possible_abbrevs])
         )
         possible_tz.sort()
         return [
@@ -93,6 +102,13 @@ class Timestamps(commands.Cog):
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
 
+    def warm_up(self) -> None:
+        """Build the time zones table and import dateutil ahead of their first use."""
+
+        import dateutil.parser  # noqa: F401
+
+        get_tz_data()
+
     def _make_timestamps_embed(
         self, dt: datetime, style: app_commands.Choice[str] | None = None
     ) -> discord.Embed:
@@ -8,6 +8,7 @@ from sqlalchemy import delete, func, select, update
 from sqlalchemy.exc import IntegrityError
 
 from ..bot import Bot
+from ..cache import CacheNeeds
 from ..utils import relative_dt
 from ..utils.checks import has_guild_permissions
 from ..utils.views import confirm_prompt
@@ -43,6 +44,10 @@ class Tips(commands.Cog):
         description="Save and share tips for people on the server!",
         guild_only=True,
     )
+    cache_needs = CacheNeeds(
+        intents=discord.Intents(members=True),
+        fallback="the tips' authors are fetched from Discord every time they are shown",
+    )
 
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
@@ -54,7 +59,9 @@ class Tips(commands.Cog):
         suggestions = [Choice(name=tip.name, value=tip.name) for tip in tips]
 
         LOGGER.debug(
-            f"tip_name_autocomplete: {current=}, {len(suggestions)} suggestions"
+            "tip_name_autocomplete: current=%r, %s suggestions",
+            current,
+            len(suggestions),
         )
 
         return suggestions
@@ -70,8 +77,9 @@ class Tips(commands.Cog):
         ][:25]
 
         LOGGER.debug(
-            f"tip_name_from_author_autocomplete: {current=}, "
-            f"{len(suggestions)} suggestions"
+            "tip_name_from_author_autocomplete: current=%r, %s suggestions",
+            current,
+            len(suggestions),
         )
 
         return suggestions
@@ -80,11 +88,11 @@ class Tips(commands.Cog):
     async def tip_create(self, interaction: discord.Interaction) -> None:
         """Create a new tip for the current server, owned by you."""
 
-        LOGGER.debug(f"Creating a tip in guild {interaction.guild}.")
+        LOGGER.debug("Creating a tip in guild %s.", interaction.guild)
         modal = views.TipCreate()
         await interaction.response.send_modal(modal)
         await modal.wait()
-        LOGGER.debug(f"Tip {modal.name.value!r} received.")
+        LOGGER.debug("Tip %r received.", modal.name.value)
 
         assert interaction.guild is not None
 
@@ -154,7 +162,7 @@ class Tips(commands.Cog):
             )
             return
 
-        LOGGER.debug(f"Editing tip {name} in {interaction.guild}")
+        LOGGER.debug("Editing tip %s in %s", name, interaction.guild)
         modal = views.TipEdit(tip)
         await interaction.response.send_modal(modal)
         await modal.wait()
@@ -195,7 +203,9 @@ class Tips(commands.Cog):
             )
             return
 
-        tip_author = interaction.guild.get_member(tip.author_id)
+        tip_author = await self.bot.get_or_fetch_member(
+            interaction.guild, tip.author_id
+        )
         embed = (
             discord.Embed(
                 title=f"Tip {tip.name} Information",
@@ -342,7 +352,7 @@ class Tips(commands.Cog):
         await interaction.response.send_message(
             f"Transferring tip `{name}` to {member.mention}",
         )
-        LOGGER.debug(f"Tip {name} transfered to {member}")
+        LOGGER.debug("Tip %s transfered to %s", name, member)
 
     @tip.command(name="claim")
     @app_commands.describe(name="Name of the tip.")
@@ -375,7 +385,7 @@ class Tips(commands.Cog):
         await interaction.response.send_message(
             f"Claiming tip `{name}` for yourself.", ephemeral=True
         )
-        LOGGER.debug(f"Tip {name} claimed by {interaction.user}")
+        LOGGER.debug("Tip %s claimed by %s", name, interaction.user)
 
     @tip.command(name="list")
     @app_commands.describe(member="Author of the tips.")
@@ -393,7 +403,7 @@ class Tips(commands.Cog):
             member = interaction.user
 
         tips = await self._get_member_tips(member)
-        LOGGER.debug(f"Listing {len(tips)} tips for {interaction.guild.name}")
+        LOGGER.debug("Listing %s tips for %s", len(tips), interaction.guild.name)
 
         if tips:
             # todo: have a paginated version
@@ -415,7 +425,7 @@ class Tips(commands.Cog):
         assert interaction.guild is not None
 
         tips = await self._get_guild_tips(interaction.guild)
-        LOGGER.debug(f"Listing {len(tips)} tips for {interaction.guild.name}")
+        LOGGER.debug("Listing %s tips for %s", len(tips), interaction.guild.name)
 
         if tips:
             max_id_length = max(len(str(tip.id)) for tip in tips)
@@ -519,12 +529,12 @@ class Tips(commands.Cog):
         if member is None:
             # guild stats
             embed = await self.tip_stats_guild(interaction.guild)
-            LOGGER.debug(f"Sending tip stats for guild {interaction.guild.name}")
+            LOGGER.debug("Sending tip stats for guild %s", interaction.guild.name)
         else:
             # member stats
             embed = await self.tip_stats_member(member)
             LOGGER.debug(
-                f"Sending tip stats for member {member} in {member.guild.name}"
+                "Sending tip stats for member %s in %s", member, member.guild.name
             )
 
         await interaction.response.send_message(embed=embed)
@@ -535,7 +545,7 @@ class Tips(commands.Cog):
         async with self.bot.db.session() as session, session.begin():
             session.add(tip)
 
-        LOGGER.debug(f"Tip {tip.name} saved.")
+        LOGGER.debug("Tip %s saved.", tip.name)
 
     async def _edit_tip(
         self,
@@ -558,7 +568,7 @@ class Tips(commands.Cog):
                 .where(Tip.id == tip.id)
             )
 
-        LOGGER.debug(f"Tip {tip.id} edited.")
+        LOGGER.debug("Tip %s edited.", tip.id)
 
     async def _get_tip_by_name(
         self, interaction: discord.Interaction, name: str
@@ -576,12 +586,10 @@ class Tips(commands.Cog):
             )
 
         if tip is None:
-            log = f"No tip named {name!r} in guild {interaction.guild.id}"
+            LOGGER.debug("No tip named %r in guild %s", name, interaction.guild.id)
 
         else:
-            log = f"Found tip {tip.name!r} for guild {tip.guild_id}"
-
-        LOGGER.debug(log)
+            LOGGER.debug("Found tip %r for guild %s", tip.name, tip.guild_id)
 
         return tip
 
@@ -602,18 +610,19 @@ class Tips(commands.Cog):
             )
 
         if tip is not None:
-            log = (
-                f"Found tip {tip.name} "
-                f"for member {tip.author_id} "
-                f"and guild {tip.guild_id}."
+            LOGGER.debug(
+                "Found tip %s for member %s and guild %s.",
+                tip.name,
+                tip.author_id,
+                tip.guild_id,
             )
         else:
-            log = (
-                f"No tip named {name} for member {interaction.user.id} "
-                f"in guild {interaction.guild.id}"
+            LOGGER.debug(
+                "No tip named %s for member %s in guild %s",
+                name,
+                interaction.user.id,
+                interaction.guild.id,
             )
-
-        LOGGER.debug(log)
         return tip
 
     async def _get_tips_names_like(
@@ -631,7 +640,7 @@ class Tips(commands.Cog):
             )
 
         LOGGER.debug(
-            f"Searched tip names like {substring} in guild {interaction.guild}"
+            "Searched tip names like %s in guild %s", substring, interaction.guild
         )
         return list(tips)
 
@@ -646,7 +655,7 @@ class Tips(commands.Cog):
                 )
             )
 
-        LOGGER.debug(f"Searched all tips from member {member}")
+        LOGGER.debug("Searched all tips from member %s", member)
         return list(tips)
 
     async def _get_guild_tips(self, guild: discord.Guild) -> list[Tip]:
@@ -657,7 +666,7 @@ class Tips(commands.Cog):
                 select(Tip).where(Tip.guild_id == guild.id).order_by(Tip.id)
             )
 
-        LOGGER.debug(f"Searched all tips for guild {guild}")
+        LOGGER.debug("Searched all tips for guild %s", guild)
         return list(tips)
 
     async def _get_guild_totals(self, guild: discord.Guild) -> TipCounts:
@@ -672,7 +681,7 @@ class Tips(commands.Cog):
 
         result = next(results)
         totals = TipCounts(tips=result[0], uses=result[1])
-        LOGGER.debug(f"Found {result} tips from guild {guild}")
+        LOGGER.debug("Found %s tips from guild %s", result, guild)
         return totals
 
     async def _get_guild_top_tips(
@@ -688,7 +697,7 @@ class Tips(commands.Cog):
                 .limit(amount)
             )
 
-        LOGGER.debug(f"Searched top tips for guild {guild}")
+        LOGGER.debug("Searched top tips for guild %s", guild)
         return list(top_tips)
 
     async def _get_guild_top_authors(
@@ -723,7 +732,7 @@ class Tips(commands.Cog):
 
         result = next(results)
         totals = TipCounts(tips=result[0], uses=result[1])
-        LOGGER.debug(f"Found {result} tips from member {member}")
+        LOGGER.debug("Found %s tips from member %s", result, member)
         return totals
 
     async def _get_member_top_tips(
@@ -742,7 +751,7 @@ class Tips(commands.Cog):
                 .limit(amount)
             )
 
-        LOGGER.debug(f"Searched top tips for member {member}")
+        LOGGER.debug("Searched top tips for member %s", member)
         return list(top_tips)
 
     async def _increase_tip_uses(self, tip: Tip) -> None:
@@ -753,7 +762,7 @@ class Tips(commands.Cog):
                 update(Tip).where(Tip.id == tip.id).values(uses=tip.uses + 1)
             )
 
-        LOGGER.debug(f"Increased uses for {tip.id=}")
+        LOGGER.debug("Increased uses for tip.id=%r", tip.id)
 
     async def _delete_tip(self, tip: Tip) -> None:
         """Delete a tip from the database."""
@@ -761,7 +770,7 @@ class Tips(commands.Cog):
         async with self.bot.db.session() as session, session.begin():
             await session.execute(delete(Tip).where(Tip.id == tip.id))
 
-        LOGGER.debug(f"Deleted tip with {tip.id=}")
+        LOGGER.debug("Deleted tip with tip.id=%r", tip.id)
 
     async def _delete_member_tips(self, member: discord.Member) -> None:
         """Delete all tips from a member, in a specific server."""
@@ -776,4 +785,4 @@ class Tips(commands.Cog):
 
         deleted = result.rowcount
 
-        LOGGER.debug(f"Deleted {deleted} tips from {member=}")
+        LOGGER.debug("Deleted %s tips from member=%r", deleted, member)
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import importlib
+import importlib.abc
+import importlib.util
 import logging
 import sys
+import time
+from dataclasses import dataclass
 from importlib.metadata import version
 from textwrap import dedent
 from typing import TYPE_CHECKING
@@ -10,16 +16,58 @@ import aiohttp
 import discord
 from discord.ext import commands
 
+from .cache import CACHE_PRESETS
 from .database import Database
+from .http_session import HTTPConfig, HTTPStats, create_session
+from .loop_monitor import LoopMonitor
+from .members import MemberResolver
+from .shards import ShardMonitor
+from .supervisor import DrainReport, TaskSupervisor
 from .tree import CommandTree
 
 if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Sequence
+    from importlib.machinery import ModuleSpec
+    from types import ModuleType
     from typing import Any, Self
 
+    from .cache import CacheNeeds, CachePreset
+    from .metrics import MetricsServer
+
 
 LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class ExtensionTiming:
+    """Time spent loading an extension, in seconds."""
+
+    import_: float = 0.0
+    setup: float = 0.0
+    cog_load: float = 0.0
+
+    @property
+    def total(self) -> float:
+        return self.import_ + self.setup + self.cog_load
+
+
+class _ImportedLoader(importlib.abc.Loader):
+    """Loader of an extension already imported in a worker thread, so that
+    load_extension() sets it up without executing its module again.
+    """
+
+    def __init__(self, module: ModuleType) -> None:
+        self.module = module
+        self.spec = module.__spec__
+
+    def create_module(self, spec: ModuleSpec) -> ModuleType:
+        return self.module
+
+    def exec_module(self, module: ModuleType) -> None:
+        # already executed, only give the module its own spec back
+        module.__spec__ = self.spec
+
+
 class Bot[**BotP](commands.Bot):
     # Suppress error on the User attribute being None since it fills up later
     user: discord.ClientUser  # type: ignore[reportIncompatibleMethodOverride]
@@ -28,35 +76,232 @@ class Bot[**BotP](commands.Bot):
         self.db_name = kwargs.get("db_name")
         self.permissions = kwargs.get("permissions", discord.Permissions.text())
         self.startup_extensions = kwargs.get("startup_extensions", [])
+        self.warm_up_cogs: bool | Collection[str] = kwargs.get("warm_up_cogs", True)
+        self.metrics_host: str = kwargs.get("metrics_host", "127.0.0.1")
+        self.metrics_port: int | None = kwargs.get("metrics_port")
+        self.slow_callback_threshold: float | None = kwargs.get(
+            "slow_callback_threshold", 0.25
+        )
+        self.shutdown_timeout: float = kwargs.get("shutdown_timeout", 10.0)
+        self.http_config: HTTPConfig = kwargs.get("http_config", HTTPConfig())
         kwargs["tree_cls"] = kwargs.get("tree_cls", CommandTree)
+
+        self.cache_preset: CachePreset | None = kwargs.get("cache_preset")
+        if isinstance(self.cache_preset, str):
+            self.cache_preset = CACHE_PRESETS[self.cache_preset]
+        if self.cache_preset is not None:
+            kwargs["intents"] = self.cache_preset.intents(kwargs["intents"])
+            kwargs.setdefault(
+                "member_cache_flags",
+                self.cache_preset.member_cache_flags(kwargs["intents"]),
+            )
+            kwargs.setdefault(
+                "chunk_guilds_at_startup", self.cache_preset.chunk_guilds_at_startup
+            )
+
+        # the CommandTree times the interactions' responses with it
+        http_trace: aiohttp.TraceConfig = kwargs.setdefault(
+            "http_trace", aiohttp.TraceConfig()
+        )
+
         super().__init__(*args, **kwargs)
+        self.member_resolver = MemberResolver()
+        self.extension_timings: dict[str, ExtensionTiming] = {}
+        self._loading_extension: str | None = None
+        self._warm_up_task: asyncio.Task | None = None
+        self.metrics: MetricsServer | None = None
+        self.loop_monitor: LoopMonitor | None = None
+        self.supervisor = TaskSupervisor()
+        self.http_stats = HTTPStats()
+        self.shard_monitor = ShardMonitor(self)
+        self.shard_monitor.add_listeners()
+        self.add_listener(self._forget_not_member, "on_member_join")
+        if isinstance(self.tree, CommandTree):
+            self.tree.trace_responses(http_trace)
+            self.add_listener(
+                self.tree.on_app_command_completion, "on_app_command_completion"
+            )
+
+    def dispatch(self, event_name: str, /, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Subclass the dispatch() method to let the shard monitor see which
+        shard's websocket dispatches the events.
+        """
+
+        self.shard_monitor.dispatched(event_name, *args)
+        super().dispatch(event_name, *args, **kwargs)
 
     async def setup_hook(self) -> None:
+        if self.slow_callback_threshold is not None:
+            self.loop_monitor = LoopMonitor(threshold=self.slow_callback_threshold)
+            self.loop_monitor.start()
+
         # Create HTTP session
-        self.http_session = aiohttp.ClientSession()
+        self.http_session = create_session(self.http_config, self.http_stats)
 
         # Make DB connection
         self.db = Database(self.db_name)
 
-        for extension in self.startup_extensions:
+        if self.metrics_port is not None:
+            await self._start_metrics(self.metrics_port)
+
+        await self._load_extensions()
+
+        self.boot_time = discord.utils.utcnow()
+
+    async def _start_metrics(self, port: int) -> None:
+        """Serve the metrics, and start recording the ones only they use."""
+
+        from .metrics import MetricsServer
+
+        self.db.track_query_times()
+        self.metrics = MetricsServer(self, host=self.metrics_host, port=port)
+        await self.metrics.start()
+
+    async def add_cog(
+        self,
+        cog: commands.Cog,
+        /,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        """Subclass the add_cog() method to time the cog_load of extensions,
+        and warn about the intents the cog needs but are not enabled.
+        """
+
+        needs: CacheNeeds | None = getattr(cog, "cache_needs", None)
+        if needs is not None and (missing := needs.missing_intents(self.intents)):
+            LOGGER.warning(
+                "%s works best with the %s intents: %s",
+                cog.qualified_name,
+                ", ".join(missing),
+                needs.fallback,
+            )
+
+        start = time.perf_counter()
+        await super().add_cog(cog, **kwargs)
+        if self._loading_extension is not None:
+            timing = self.extension_timings[self._loading_extension]
+            timing.cog_load += time.perf_counter() - start
+
+    async def _load_extensions(self) -> None:
+        """Load the startup extensions, importing their modules concurrently.
+
+        The modules, and the heavy dependencies they import, are imported in
+        worker threads first. The extensions are then set up on the loop in
+        the order they were given, so the cogs are added deterministically,
+        from the modules already imported instead of executing them again.
+        """
+
+        import_times = await asyncio.gather(
+            *(
+                asyncio.to_thread(self._import_extension, extension)
+                for extension in self.startup_extensions
+            )
+        )
+
+        # the imported modules declared their tables, which the cogs can
+        # query when they load
+        await self.db.initialise_database()
+
+        for extension, import_time in zip(
+            self.startup_extensions, import_times, strict=True
+        ):
+            timing = ExtensionTiming(import_=import_time)
+            self.extension_timings[extension] = timing
+            self._loading_extension = extension
+            # load_extension() finds the spec of a module already imported
+            # in the module itself, so give it one reusing the module
+            loader = None
+            module = sys.modules.get(extension)
+            if module is not None and module.__spec__ is not None:
+                loader = _ImportedLoader(module)
+                module.__spec__ = importlib.util.spec_from_loader(
+                    extension,
+                    loader,
+                    origin=loader.spec.origin,
+                    is_package=loader.spec.submodule_search_locations is not None,
+                )
+
+            start = time.perf_counter()
             try:
-                LOGGER.debug(f"Loading {extension}... ")
+                LOGGER.debug("Loading %s... ", extension)
                 await self.load_extension(extension)
             except Exception:
-                LOGGER.exception(f"Exception while loading {extension}")
+                LOGGER.exception("Exception while loading %s", extension)
+                del self.extension_timings[extension]
             else:
-                LOGGER.debug(f"{extension} loaded successfully.")
+                LOGGER.debug("%s loaded successfully.", extension)
+                elapsed = time.perf_counter() - start - timing.cog_load
+                if loader is None:
+                    # imported on the loop, so most of it is the import
+                    timing.import_ += elapsed
+                else:
+                    timing.setup = elapsed
+            finally:
+                self._loading_extension = None
+                if loader is not None:
+                    loader.module.__spec__ = loader.spec
 
-        await self.db.initialise_database()
+        for extension, timing in self.extension_timings.items():
+            LOGGER.info(
+                "Loaded %s in %.0fms (import %.0fms, setup %.0fms, cog_load %.0fms)",
+                extension,
+                timing.total * 1000,
+                timing.import_ * 1000,
+                timing.setup * 1000,
+                timing.cog_load * 1000,
+            )
 
-        self.boot_time = discord.utils.utcnow()
+    @staticmethod
+    def _import_extension(extension: str) -> float:
+        """Import the extension's module, and return how long it took."""
+
+        start = time.perf_counter()
+        try:
+            importlib.import_module(extension)
+        except Exception:  # noqa: BLE001
+            # load_extension will raise it again, and log it
+            return 0.0
+
+        return time.perf_counter() - start
 
     async def close(self) -> None:
-        """Subclass the close() method to close the HTTP Session."""
+        """Subclass the close() method to drain the background work before
+        closing the HTTP Session and the database.
+
+        New interactions are ignored while the supervised tasks are drained,
+        then the extensions are unloaded, which flushes the cogs' buffers to
+        the database, and finally the resources are torn down.
+        """
+
+        if self.supervisor.closing:
+            await super().close()
+            return
 
+        report = DrainReport()
+        try:
+            async with asyncio.timeout(self.shutdown_timeout):
+                await self.supervisor.drain(report)
+        except TimeoutError:
+            await self.supervisor.cancel(report)
+
+        LOGGER.info(
+            "Drained %s tasks before shutdown, %s failed and %s were cancelled",
+            len(report.drained),
+            len(report.failed),
+            len(report.cancelled),
+        )
+        if report.cancelled:
+            LOGGER.warning("Cancelled tasks: %s", ", ".join(report.cancelled))
+
+        # unloads the extensions, and closes the connection to Discord
+        await super().close()
+
+        if self.metrics is not None:
+            await self.metrics.close()
+        if self.loop_monitor is not None:
+            self.loop_monitor.close()
         await self.http_session.close()
         await self.db.engine.dispose()
-        await super().close()
 
     async def on_ready(self) -> None:
         if self.user is None:
@@ -83,6 +328,38 @@ class Bot[**BotP](commands.Bot):
             )
         )
 
+        if self._warm_up_task is None:
+            self._warm_up_task = self.supervisor.spawn(self._warm_up(), name="warm-up")
+
+    async def _warm_up(self) -> None:
+        """Build the heavy data of the cogs in worker threads, ahead of its first use.
+
+        Cogs that import heavy dependencies or build large tables do it lazily,
+        and can define a synchronous warm_up() method to do it after the bot is
+        ready instead. The warm_up_cogs option is either a bool to warm up all
+        or none of the cogs, or the names of the cogs to warm up.
+        """
+
+        if self.warm_up_cogs is False:
+            return
+
+        for name, cog in list(self.cogs.items()):
+            warm_up = getattr(cog, "warm_up", None)
+            if warm_up is None or (
+                self.warm_up_cogs is not True and name not in self.warm_up_cogs
+            ):
+                continue
+
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(warm_up)
+            except Exception:
+                LOGGER.exception("Exception while warming up %s", name)
+            else:
+                LOGGER.debug(
+                    "Warmed up %s in %.0fms", name, (time.perf_counter() - start) * 1000
+                )
+
     async def on_command_error(
         self, ctx: commands.Context, exception: commands.CommandError, /
     ) -> None:
@@ -118,23 +395,61 @@ class Bot[**BotP](commands.Bot):
             or not error_handled  # or the error is not handled
         ):
             LOGGER.error(
-                f"Exception {exception} raised in {command}", exc_info=exception
+                "Exception %s raised in %s", exception, command, exc_info=exception
             )
         else:
-            LOGGER.debug(f"Exception in command {command} was already handled")
+            LOGGER.debug("Exception in command %s was already handled", command)
+
+    @property
+    def own_shard_ids(self) -> Sequence[int] | None:
+        """IDs of the shards this bot connects with, or None when it connects
+        with all of them.
+        """
+
+        return None if self.shard_id is None else [self.shard_id]
+
+    def owns_guild(self, guild_id: int) -> bool:
+        """Whether the guild is handled by one of this bot's shards.
+
+        When the shards are split between several processes, background work
+        on guilds should only be done by the process that owns them.
+        """
+
+        shard_ids = self.own_shard_ids
+        if shard_ids is None:
+            return True
+
+        return (guild_id >> 22) % (self.shard_count or 1) in shard_ids
 
     async def get_or_fetch_member(
         self, guild: discord.Guild, member_id: int
     ) -> discord.Member | None:
         """Look up a member in cache, or fetches if not found."""
 
-        member = guild.get_member(member_id)
-        if member is not None:
-            return member
+        members = await self.member_resolver.resolve(guild, [member_id])
+        return members.get(member_id)
+
+    async def get_or_fetch_members(
+        self, guild: discord.Guild, member_ids: Iterable[int]
+    ) -> dict[int, discord.Member]:
+        """Look up members in cache, and fetch the missing ones in batches.
+
+        Members that cannot be found are absent from the returned dictionary.
+        """
+
+        return await self.member_resolver.resolve(guild, member_ids)
+
+    async def _forget_not_member(self, member: discord.Member) -> None:
+        self.member_resolver.forget(member.guild.id, member.id)
+
 
-        members = await guild.query_members(limit=1, user_ids=[member_id])
+class AutoShardedBot[**BotP](Bot[BotP], commands.AutoShardedBot):
+    """Bot that connects to Discord with several shards.
 
-        if len(members) == 0:
-            return None
+    Pass ``shard_count`` and ``shard_ids`` to split the shards between several
+    processes, or neither to use the number of shards recommended by Discord.
+    """
 
-        return members[0]
+    @property
+    def own_shard_ids(self) -> Sequence[int] | None:
+        return self.shard_ids
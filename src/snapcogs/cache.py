@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import discord
+
+
+@dataclass(frozen=True)
+class CachePreset:
+    """How much of the guilds' members the bot receives and keeps in memory.
+
+    - ``full``: every member is cached, with their presence, and the guilds
+      are chunked at startup. Memory grows with the total number of members.
+    - ``lazy``: members are cached when they join or show up in events, and
+      the others are fetched in batches when needed.
+    - ``minimal``: no member is cached, and no member event is received. The
+      members are always fetched in batches when needed.
+    """
+
+    name: str
+    members_intent: bool
+    presences_intent: bool
+    joined: bool
+    chunk_guilds_at_startup: bool
+
+    def intents(self, intents: discord.Intents) -> discord.Intents:
+        """Return a copy of the intents, with the preset's member intents."""
+
+        intents = discord.Intents._from_value(intents.value)
+        intents.members = self.members_intent
+        intents.presences = self.presences_intent
+        return intents
+
+    def member_cache_flags(self, intents: discord.Intents) -> discord.MemberCacheFlags:
+        return discord.MemberCacheFlags(joined=self.joined, voice=intents.voice_states)
+
+
+CACHE_PRESETS = {
+    preset.name: preset
+    for preset in (
+        CachePreset(
+            "full",
+            members_intent=True,
+            presences_intent=True,
+            joined=True,
+            chunk_guilds_at_startup=True,
+        ),
+        CachePreset(
+            "lazy",
+            members_intent=True,
+            presences_intent=False,
+            joined=True,
+            chunk_guilds_at_startup=False,
+        ),
+        CachePreset(
+            "minimal",
+            members_intent=False,
+            presences_intent=False,
+            joined=False,
+            chunk_guilds_at_startup=False,
+        ),
+    )
+}
+
+
+@dataclass(frozen=True)
+class CacheNeeds:
+    """Gateway intents a cog uses, and how it behaves without them.
+
+    Cogs declare it as their ``cache_needs`` class attribute, and the bot
+    warns when they are loaded without the intents.
+    """
+
+    intents: discord.Intents = field(default_factory=discord.Intents.none)
+    fallback: str = ""
+
+    def missing_intents(self, intents: discord.Intents) -> list[str]:
+        """Return the names of the needed intents that are not enabled."""
+
+        missing = discord.Intents._from_value(self.intents.value & ~intents.value)
+        return [name for name, enabled in missing if enabled]
@@ -1,6 +1,17 @@
-from sqlalchemy import URL
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from sqlalchemy import URL, Connection, event, inspect, text
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.schema import CreateIndex
+
+from .utils.stats import Histogram
+
+if TYPE_CHECKING:
+    from typing import Any
 
 
 class Base(DeclarativeBase):
@@ -20,7 +31,61 @@ class Database:
 
         self.engine = create_async_engine(database_url)
         self.session = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.query_times: Histogram | None = None
+
+    def track_query_times(self) -> None:
+        """Record the duration of every query in the query_times histogram."""
+
+        if self.query_times is not None:
+            return
+
+        self.query_times = Histogram()
+        event.listen(self.engine.sync_engine, "before_cursor_execute", self._before)
+        event.listen(self.engine.sync_engine, "after_cursor_execute", self._after)
+
+    @staticmethod
+    def _before(conn: Connection, *_: Any) -> None:  # noqa: ANN401
+        # a connection runs one query at a time, and failed queries never reach
+        # _after, so their start is overwritten by the next query
+        conn.info["query_start"] = time.perf_counter()
+
+    def _after(self, conn: Connection, *_: Any) -> None:  # noqa: ANN401
+        start = conn.info.pop("query_start", None)
+        if start is not None and self.query_times is not None:
+            self.query_times.observe(time.perf_counter() - start)
 
     async def initialise_database(self) -> None:
         async with self.engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(self._add_columns)
+            await conn.run_sync(self._create_indexes)
+
+    @staticmethod
+    def _add_columns(conn: Connection) -> None:
+        """Add the nullable columns added to tables that already existed."""
+
+        # create_all only creates the columns of the tables it creates
+        inspector = inspect(conn)
+        preparer = conn.dialect.identifier_preparer
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {preparer.format_table(table)} "
+                        f"ADD COLUMN {preparer.format_column(column)} "
+                        f"{column.type.compile(conn.dialect)}"
+                    )
+                )
+
+    @staticmethod
+    def _create_indexes(conn: Connection) -> None:
+        """Create the indexes added to tables that already existed."""
+
+        # create_all only creates the indexes of the tables it creates
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+from .utils.stats import Histogram
+
+if TYPE_CHECKING:
+    from types import SimpleNamespace
+
+
+@dataclass(frozen=True)
+class HTTPConfig:
+    """Settings of the bot's shared HTTP session.
+
+    Limits are numbers of connections, and timeouts are in seconds.
+    """
+
+    limit: int = 100
+    limit_per_host: int = 10
+    keepalive_timeout: float = 30.0
+    ttl_dns_cache: int = 300
+    total_timeout: float = 30.0
+    connect_timeout: float = 10.0
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    errors: int = 0
+    latency: Histogram = field(default_factory=Histogram)
+    pool_wait: Histogram = field(default_factory=Histogram)
+
+
+class HTTPStats:
+    """Per host request latency and connection pool wait times, and the
+    number of requests in flight.
+    """
+
+    def __init__(self) -> None:
+        self.hosts: dict[str, HostStats] = {}
+        self.in_flight = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_queued_start.append(self._on_queued_start)
+        trace_config.on_connection_queued_end.append(self._on_queued_end)
+        trace_config.on_request_end.append(self._on_request_end)
+        trace_config.on_request_exception.append(self._on_request_exception)
+        return trace_config
+
+    def _host_stats(self, context: SimpleNamespace) -> HostStats:
+        return self.hosts.setdefault(context.host, HostStats())
+
+    async def _on_request_start(
+        self,
+        _: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestStartParams,
+    ) -> None:
+        context.host = params.url.host or "unknown"
+        context.start = time.perf_counter()
+        self.in_flight += 1
+
+    async def _on_queued_start(
+        self,
+        _: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        __: aiohttp.TraceConnectionQueuedStartParams,
+    ) -> None:
+        context.queued_at = time.perf_counter()
+
+    async def _on_queued_end(
+        self,
+        _: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        __: aiohttp.TraceConnectionQueuedEndParams,
+    ) -> None:
+        wait = time.perf_counter() - context.queued_at
+        self._host_stats(context).pool_wait.observe(wait)
+
+    async def _on_request_end(
+        self,
+        _: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        __: aiohttp.TraceRequestEndParams,
+    ) -> None:
+        self.in_flight -= 1
+        stats = self._host_stats(context)
+        stats.requests += 1
+        stats.latency.observe(time.perf_counter() - context.start)
+
+    async def _on_request_exception(
+        self,
+        _: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        __: aiohttp.TraceRequestExceptionParams,
+    ) -> None:
+        self.in_flight -= 1
+        stats = self._host_stats(context)
+        stats.requests += 1
+        stats.errors += 1
+
+
+def create_session(config: HTTPConfig, stats: HTTPStats) -> aiohttp.ClientSession:
+    """Create an HTTP session with the config's limits, whose requests are
+    recorded in the stats.
+    """
+
+    connector = aiohttp.TCPConnector(
+        limit=config.limit,
+        limit_per_host=config.limit_per_host,
+        keepalive_timeout=config.keepalive_timeout,
+        ttl_dns_cache=config.ttl_dns_cache,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=config.total_timeout, connect=config.connect_timeout
+    )
+
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        trace_configs=[stats.trace_config()],
+    )
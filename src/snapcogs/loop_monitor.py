@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import sys
+import threading
+import time
+import traceback
+
+from .utils.stats import Histogram
+
+LOGGER = logging.getLogger(__name__)
+
+# upper bounds of the loop lag buckets, in seconds
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, math.inf)
+
+
+class LoopMonitor:
+    """Measure the event loop's scheduling lag, and sample what blocks it.
+
+    A task sleeps for a fixed interval and records how late it wakes up. A
+    watcher thread checks that the task keeps waking up, and when it is late
+    by more than the threshold, logs the stack of the loop's thread, which is
+    the callback blocking the loop at that moment. Each stall is sampled once.
+    """
+
+    def __init__(self, *, interval: float = 0.5, threshold: float = 0.25) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.lag = Histogram(LAG_BUCKETS)
+        self.last_lag = 0.0
+        self.slow_callbacks = 0
+        self._tick = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Start monitoring the running loop."""
+
+        self._loop_thread_id = threading.get_ident()
+        self._tick = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._measure())
+        self._thread = threading.Thread(
+            target=self._watch, name="snapcogs-loop-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop monitoring, the watcher thread exits on its next check."""
+
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _measure(self) -> None:
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._tick = now
+            self.last_lag = max(now - start - self.interval, 0.0)
+            self.lag.observe(self.last_lag)
+
+    def _watch(self) -> None:
+        sampled_tick = None
+        while not self._stop.wait(self.threshold / 2):
+            tick = self._tick
+            blocked = time.monotonic() - tick - self.interval
+            if blocked < self.threshold or tick == sampled_tick:
+                continue
+
+            sampled_tick = tick
+            self.slow_callbacks += 1
+            frame = sys._current_frames().get(self._loop_thread_id)  # type: ignore[arg-type]
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            LOGGER.warning(
+                "Event loop blocked for more than %.2fs, in:\n%s", blocked, stack
+            )
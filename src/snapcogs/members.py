@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import discord
+
+LOGGER = logging.getLogger(__name__)
+
+# maximum number of user IDs in a single query_members request
+QUERY_MEMBERS_LIMIT = 100
+# number of "not a member" entries above which the expired ones are pruned
+NEGATIVE_CACHE_PRUNE_SIZE = 10_000
+
+
+@dataclass
+class ResolverStats:
+    hits: int = 0
+    misses: int = 0
+    negative_hits: int = 0
+    coalesced: int = 0
+    batches: int = 0
+    batched_ids: int = 0
+
+    @property
+    def average_batch_size(self) -> float:
+        return self.batched_ids / self.batches if self.batches else 0.0
+
+
+class MemberResolver:
+    """Look up members in cache, and fetch the missing ones in batches.
+
+    Lookups of the same guild made within a short window are coalesced into a
+    single query_members request of up to 100 IDs, lookups of an ID already
+    being fetched wait for the same request, and IDs that are not members of
+    the guild are remembered for a while.
+    """
+
+    def __init__(self, *, window: float = 0.05, negative_ttl: float = 300.0) -> None:
+        self.window = window
+        self.negative_ttl = negative_ttl
+        self.stats = ResolverStats()
+        # guild ID -> member ID -> future, waiting for the window to end
+        self._waiting: dict[int, dict[int, asyncio.Future[discord.Member | None]]] = {}
+        self._flush_handles: dict[int, asyncio.TimerHandle] = {}
+        # (guild ID, member ID) -> future, being fetched
+        self._in_flight: dict[
+            tuple[int, int], asyncio.Future[discord.Member | None]
+        ] = {}
+        # (guild ID, user ID) -> expiry time of the "not a member" result
+        self._not_members: dict[tuple[int, int], float] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def resolve(
+        self, guild: discord.Guild, member_ids: Iterable[int]
+    ) -> dict[int, discord.Member]:
+        """Return the members of the guild with the given IDs.
+
+        Members that cannot be found are absent from the returned dictionary.
+        """
+
+        members: dict[int, discord.Member] = {}
+        futures: dict[int, asyncio.Future[discord.Member | None]] = {}
+        for member_id in set(member_ids):
+            member = guild.get_member(member_id)
+            if member is not None:
+                self.stats.hits += 1
+                members[member_id] = member
+            elif self._is_not_member(guild.id, member_id):
+                self.stats.negative_hits += 1
+            else:
+                self.stats.misses += 1
+                futures[member_id] = self._request(guild, member_id)
+
+        if futures:
+            # shield the shared futures from the cancellation of this lookup
+            results = await asyncio.gather(
+                *(asyncio.shield(future) for future in futures.values())
+            )
+            members.update(
+                (member_id, member)
+                for member_id, member in zip(futures, results, strict=True)
+                if member is not None
+            )
+
+        return members
+
+    def forget(self, guild_id: int, user_id: int) -> None:
+        """Forget that the user is not a member of the guild, when they join it."""
+
+        self._not_members.pop((guild_id, user_id), None)
+
+    def _is_not_member(self, guild_id: int, member_id: int) -> bool:
+        expires_at = self._not_members.get((guild_id, member_id))
+        if expires_at is None:
+            return False
+
+        if expires_at < time.monotonic():
+            del self._not_members[guild_id, member_id]
+            return False
+
+        return True
+
+    def _request(
+        self, guild: discord.Guild, member_id: int
+    ) -> asyncio.Future[discord.Member | None]:
+        """Return the future of the member, joining an existing request if any."""
+
+        future = self._in_flight.get((guild.id, member_id))
+        if future is not None:
+            self.stats.coalesced += 1
+            return future
+
+        waiting = self._waiting.setdefault(guild.id, {})
+        future = waiting.get(member_id)
+        if future is not None:
+            self.stats.coalesced += 1
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiting[member_id] = future
+
+        if len(waiting) >= QUERY_MEMBERS_LIMIT:
+            self._flush(guild)
+        elif guild.id not in self._flush_handles:
+            self._flush_handles[guild.id] = loop.call_later(
+                self.window, self._flush, guild
+            )
+
+        return future
+
+    def _flush(self, guild: discord.Guild) -> None:
+        """Send the query for the members waiting in the guild."""
+
+        handle = self._flush_handles.pop(guild.id, None)
+        if handle is not None:
+            handle.cancel()
+
+        batch = self._waiting.pop(guild.id, {})
+        if not batch:
+            return
+
+        for member_id, future in batch.items():
+            self._in_flight[guild.id, member_id] = future
+
+        task = asyncio.create_task(self._query(guild, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _query(
+        self,
+        guild: discord.Guild,
+        batch: dict[int, asyncio.Future[discord.Member | None]],
+    ) -> None:
+        self.stats.batches += 1
+        self.stats.batched_ids += len(batch)
+        try:
+            members = await guild.query_members(limit=len(batch), user_ids=list(batch))
+        except Exception as e:  # noqa: BLE001
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # avoid "exception never retrieved" if all lookups were cancelled
+                    future.exception()
+        else:
+            found = {member.id: member for member in members}
+            expires_at = time.monotonic() + self.negative_ttl
+            for member_id, future in batch.items():
+                member = found.get(member_id)
+                if member is None:
+                    self._not_members[guild.id, member_id] = expires_at
+                if not future.done():
+                    future.set_result(member)
+
+            if len(self._not_members) > NEGATIVE_CACHE_PRUNE_SIZE:
+                self._prune_not_members()
+
+        finally:
+            for member_id in batch:
+                self._in_flight.pop((guild.id, member_id), None)
+
+        LOGGER.debug("Fetched %s members from guild %s", len(batch), guild.id)
+
+    def _prune_not_members(self) -> None:
+        now = time.monotonic()
+        self._not_members = {
+            key: expires_at
+            for key, expires_at in self._not_members.items()
+            if expires_at >= now
+        }
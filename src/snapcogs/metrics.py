@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+    from .bot import Bot
+    from .utils.stats import Histogram
+
+LOGGER = logging.getLogger(__name__)
+
+PREFIX = "snapcogs"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    return repr(float(value))
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return f"{{{pairs}}}"
+
+
+class MetricsWriter:
+    """Write metrics in the Prometheus text exposition format.
+
+    The samples of each metric are grouped together, in the order in which
+    the metrics were first written.
+    """
+
+    def __init__(self) -> None:
+        # metric name -> HELP, TYPE and sample lines
+        self._metrics: dict[str, list[str]] = {}
+
+    def render(self) -> str:
+        return (
+            "\n".join(line for lines in self._metrics.values() for line in lines) + "\n"
+        )
+
+    def _declare(self, name: str, kind: str, help_: str) -> list[str]:
+        lines = self._metrics.get(name)
+        if lines is None:
+            lines = [f"# HELP {name} {help_}", f"# TYPE {name} {kind}"]
+            self._metrics[name] = lines
+
+        return lines
+
+    @staticmethod
+    def _sample(name: str, value: float, labels: dict[str, str]) -> str:
+        return f"{name}{_format_labels(labels)} {_format_value(value)}"
+
+    def gauge(
+        self, name: str, help_: str, value: float, **labels: str
+    ) -> MetricsWriter:
+        name = f"{PREFIX}_{name}"
+        self._declare(name, "gauge", help_).append(self._sample(name, value, labels))
+        return self
+
+    def counter(
+        self, name: str, help_: str, value: float, **labels: str
+    ) -> MetricsWriter:
+        name = f"{PREFIX}_{name}_total"
+        self._declare(name, "counter", help_).append(self._sample(name, value, labels))
+        return self
+
+    def histogram(
+        self, name: str, help_: str, histogram: Histogram, **labels: str
+    ) -> MetricsWriter:
+        name = f"{PREFIX}_{name}"
+        lines = self._declare(name, "histogram", help_)
+        lines.extend(
+            self._sample(
+                f"{name}_bucket", count, {**labels, "le": _format_value(bound)}
+            )
+            for bound, count in histogram.cumulative_counts()
+        )
+        lines.append(self._sample(f"{name}_sum", histogram.sum, labels))
+        lines.append(self._sample(f"{name}_count", histogram.count, labels))
+        return self
+
+
+class MetricsServer:
+    """HTTP listener serving the bot's metrics on /metrics.
+
+    The metrics are collected when scraped, from the statistics the bot
+    already keeps, so nothing is done between scrapes.
+    """
+
+    def __init__(self, bot: Bot, *, host: str = "127.0.0.1", port: int = 9100) -> None:
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self._runner: web.AppRunner | None = None
+
+    async def start(self) -> None:
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        LOGGER.info("Serving metrics on http://%s:%s/metrics", self.host, self.port)
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_metrics(self, _: web.Request) -> web.Response:
+        from aiohttp import web
+
+        writer = MetricsWriter()
+        if self.bot.loop_monitor is None:
+            # time to get scheduled again, as a measure of how busy the loop is
+            start = time.perf_counter()
+            await asyncio.sleep(0)
+            writer.gauge(
+                "event_loop_lag_seconds",
+                "Delay of a callback scheduled on the event loop.",
+                time.perf_counter() - start,
+            )
+
+        self.collect(writer)
+
+        return web.Response(
+            text=writer.render(), content_type="text/plain", charset="utf-8"
+        )
+
+    def collect(self, writer: MetricsWriter) -> None:
+        """Write the current metrics of the bot."""
+
+        bot = self.bot
+        if bot.loop_monitor is not None:
+            writer.gauge(
+                "event_loop_lag_seconds",
+                "Delay of a callback scheduled on the event loop.",
+                bot.loop_monitor.last_lag,
+            )
+            writer.histogram(
+                "event_loop_lag_distribution_seconds",
+                "Delays of the callbacks scheduled on the event loop.",
+                bot.loop_monitor.lag,
+            )
+            writer.counter(
+                "event_loop_slow_callbacks",
+                "Callbacks that blocked the event loop past the threshold.",
+                bot.loop_monitor.slow_callbacks,
+            )
+
+        writer.gauge(
+            "gateway_latency_seconds",
+            "Latency between a gateway HEARTBEAT and its ACK.",
+            bot.latency if not math.isnan(bot.latency) else 0.0,
+        )
+        writer.gauge("guilds", "Number of guilds in cache.", len(bot.guilds))
+
+        guild_counts = bot.shard_monitor.guild_counts()
+        for shard_id, latency in bot.shard_monitor.latencies().items():
+            shard = str(shard_id)
+            writer.gauge(
+                "shard_latency_seconds",
+                "Latency between a shard's gateway HEARTBEAT and its ACK.",
+                latency,
+                shard=shard,
+            )
+            writer.gauge(
+                "shard_guilds",
+                "Number of guilds in cache, per shard.",
+                guild_counts[shard_id],
+                shard=shard,
+            )
+
+        for shard_id, stats in bot.shard_monitor.shards.items():
+            shard = str(shard_id)
+            writer.counter(
+                "shard_events",
+                "Gateway events received by a shard.",
+                stats.events,
+                shard=shard,
+            )
+            writer.counter(
+                "shard_reconnects",
+                "New or resumed gateway sessions of a shard after its first one.",
+                stats.reconnects,
+                shard=shard,
+            )
+            writer.counter(
+                "shard_disconnects",
+                "Disconnections of a shard from the gateway.",
+                stats.disconnects,
+                shard=shard,
+            )
+
+        writer.gauge(
+            "cached_members",
+            "Number of members in cache, over all guilds.",
+            sum(len(guild._members) for guild in bot.guilds),
+        )
+        writer.gauge(
+            "members",
+            "Number of members reported by Discord, over all guilds.",
+            sum(guild.member_count or 0 for guild in bot.guilds),
+        )
+        writer.gauge(
+            "asyncio_tasks",
+            "Number of tasks running on the event loop.",
+            len(asyncio.all_tasks()),
+        )
+
+        # a tree_cls not subclassing snapcogs.tree.CommandTree has no stats
+        command_stats = getattr(bot.tree, "command_stats", {})
+        for (kind, command), stats in command_stats.items():
+            labels = {"kind": kind, "command": command}
+            writer.histogram(
+                "command_duration_seconds",
+                "Time taken by application commands.",
+                stats.total,
+                **labels,
+            )
+            writer.histogram(
+                "command_first_response_seconds",
+                "Time taken by application commands to first respond.",
+                stats.first_response,
+                **labels,
+            )
+            for outcome, count in stats.outcomes.items():
+                writer.counter(
+                    "command_calls",
+                    "Application command calls, by outcome.",
+                    count,
+                    **labels,
+                    outcome=outcome,
+                )
+            writer.counter(
+                "command_near_deadline",
+                "Application command calls that responded close to the deadline.",
+                stats.near_deadline,
+                **labels,
+            )
+            writer.counter(
+                "command_missed_deadline",
+                "Application command calls that missed the response deadline.",
+                stats.missed_deadline,
+                **labels,
+            )
+
+        if bot.db.query_times is not None:
+            writer.histogram(
+                "db_query_duration_seconds",
+                "Time taken by database queries.",
+                bot.db.query_times,
+            )
+
+        writer.gauge(
+            "http_requests_in_flight",
+            "Requests of the HTTP session waiting for their response.",
+            bot.http_stats.in_flight,
+        )
+        connector = bot.http_session.connector
+        if connector is not None:
+            writer.gauge(
+                "http_connections_limit",
+                "Maximum number of connections of the HTTP session.",
+                connector.limit or math.inf,
+            )
+
+        for host, stats in bot.http_stats.hosts.items():
+            writer.counter(
+                "http_requests",
+                "Requests made by the HTTP session.",
+                stats.requests,
+                host=host,
+            )
+            writer.counter(
+                "http_request_errors",
+                "Requests of the HTTP session that raised an exception.",
+                stats.errors,
+                host=host,
+            )
+            writer.histogram(
+                "http_request_duration_seconds",
+                "Time taken by the requests of the HTTP session.",
+                stats.latency,
+                host=host,
+            )
+            writer.histogram(
+                "http_pool_wait_seconds",
+                "Time requests waited for a connection of the HTTP session.",
+                stats.pool_wait,
+                host=host,
+            )
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import math
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import discord
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from .bot import Bot
+
+# Shard of the task reading a shard's websocket, which dispatches its events.
+# Set when the shard connects, so it is unknown for its first READY.
+_current_shard: ContextVar[int | None] = ContextVar("current_shard", default=None)
+
+
+@dataclass
+class ShardStats:
+    """Gateway events received and connections made by a shard."""
+
+    events: int = 0
+    connects: int = 0
+    resumes: int = 0
+    disconnects: int = 0
+
+    @property
+    def reconnects(self) -> int:
+        """Connections after the first one, new sessions or resumed."""
+
+        return max(self.connects - 1, 0) + self.resumes
+
+
+class ShardMonitor:
+    """Per shard latency, event counts and reconnections of the bot.
+
+    The events are counted as they are dispatched, and the
+    connections with the connect, resumed and disconnect events. A bot that
+    is not sharded is reported as shard 0, or as its shard_id.
+    """
+
+    def __init__(self, bot: Bot) -> None:
+        self.bot = bot
+        self.shards: dict[int, ShardStats] = {}
+
+    def add_listeners(self) -> None:
+        if isinstance(self.bot, discord.AutoShardedClient):
+            self.bot.add_listener(self._on_shard_connect, "on_shard_connect")
+            self.bot.add_listener(self._on_shard_resumed, "on_shard_resumed")
+            self.bot.add_listener(self._on_shard_disconnect, "on_shard_disconnect")
+        else:
+            self.bot.add_listener(self._on_connect, "on_connect")
+            self.bot.add_listener(self._on_resumed, "on_resumed")
+            self.bot.add_listener(self._on_disconnect, "on_disconnect")
+
+    def dispatched(self, event: str, *args: Any) -> None:  # noqa: ANN401
+        """Count the gateway events, and remember the shard of the websocket
+        dispatching its connection.
+
+        Called by Bot.dispatch(), in the task reading the shard's websocket,
+        so counting does not schedule a listener task for every event.
+        """
+
+        if event == "socket_event_type":
+            self._count_event()
+        elif event in {"shard_connect", "shard_resumed"}:
+            _current_shard.set(args[0])
+
+    def latencies(self) -> dict[int, float]:
+        """Return the gateway latency of each shard, in seconds."""
+
+        if isinstance(self.bot, discord.AutoShardedClient):
+            latencies = self.bot.latencies
+        else:
+            latencies = [(self._shard_id, self.bot.latency)]
+
+        return {
+            shard_id: 0.0 if math.isnan(latency) else latency
+            for shard_id, latency in latencies
+        }
+
+    def guild_counts(self) -> Counter[int]:
+        """Return the number of guilds in cache of each shard."""
+
+        return Counter(guild.shard_id for guild in self.bot.guilds)
+
+    @property
+    def _shard_id(self) -> int:
+        return self.bot.shard_id or 0
+
+    def _stats(self, shard_id: int) -> ShardStats:
+        return self.shards.setdefault(shard_id, ShardStats())
+
+    def _count_event(self) -> None:
+        shard_id = _current_shard.get()
+        if shard_id is None:
+            if isinstance(self.bot, discord.AutoShardedClient):
+                # a shard's first READY, before its ID is known
+                return
+            shard_id = self._shard_id
+
+        self._stats(shard_id).events += 1
+
+    async def _on_shard_connect(self, shard_id: int) -> None:
+        self._stats(shard_id).connects += 1
+
+    async def _on_shard_resumed(self, shard_id: int) -> None:
+        self._stats(shard_id).resumes += 1
+
+    async def _on_shard_disconnect(self, shard_id: int) -> None:
+        self._stats(shard_id).disconnects += 1
+
+    async def _on_connect(self) -> None:
+        await self._on_shard_connect(self._shard_id)
+
+    async def _on_resumed(self) -> None:
+        await self._on_shard_resumed(self._shard_id)
+
+    async def _on_disconnect(self) -> None:
+        await self._on_shard_disconnect(self._shard_id)
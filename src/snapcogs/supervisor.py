@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from asyncio import Task
+    from collections.abc import Coroutine
+    from typing import Any
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class DrainReport:
+    """Names of the tasks that finished, failed or were cancelled while draining."""
+
+    drained: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+    cancelled: list[str] = field(default_factory=list)
+
+
+class TaskSupervisor:
+    """Keep track of the bot's background work, so it can be drained on shutdown.
+
+    Cogs start their background tasks with spawn(), and interactions being
+    handled are tracked by the CommandTree. Once the supervisor is closing,
+    new interactions are ignored, but the tracked tasks can still spawn the
+    work they need to finish.
+    """
+
+    def __init__(self) -> None:
+        self.closing = False
+        self._tasks: set[Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def spawn(self, coro: Coroutine[Any, Any, Any], *, name: str | None = None) -> Task:
+        """Start a task and track it until it is done."""
+
+        task = asyncio.create_task(coro, name=name)
+        self.track(task)
+        return task
+
+    def track(self, task: Task) -> None:
+        """Track a task that was started elsewhere until it is done."""
+
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def drain(self, report: DrainReport) -> None:
+        """Wait for the tracked tasks to finish, recording them in the report.
+
+        Use it with asyncio.timeout(), then cancel() the tasks still running.
+        """
+
+        self.closing = True
+        while pending := self._pending():
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                self._tasks.discard(task)
+                if task.cancelled():
+                    report.cancelled.append(task.get_name())
+                elif (error := task.exception()) is not None:
+                    LOGGER.error("Task %s failed", task.get_name(), exc_info=error)
+                    report.failed.append(task.get_name())
+                else:
+                    report.drained.append(task.get_name())
+
+    async def cancel(self, report: DrainReport) -> None:
+        """Cancel the tracked tasks, and give them a second to clean up."""
+
+        self.closing = True
+        if pending := self._pending():
+            for task in pending:
+                task.cancel()
+                report.cancelled.append(task.get_name())
+
+            await asyncio.wait(pending, timeout=1)
+
+    def _pending(self) -> set[Task]:
+        """Tracked tasks, except the one draining them."""
+
+        current = asyncio.current_task()
+        return {task for task in self._tasks if task is not current}
@@ -1,13 +1,208 @@
+from __future__ import annotations
+
+import asyncio
 import logging
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import timedelta
+from typing import TYPE_CHECKING
 
 import discord
 from discord import app_commands
 
+from .utils.stats import Histogram
+
+if TYPE_CHECKING:
+    from types import SimpleNamespace
+    from typing import Any
+
+    import aiohttp
+
 LOGGER = logging.getLogger(__name__)
 
+# Discord invalidates interactions that are not responded to within 3 seconds
+INTERACTION_DEADLINE = 3.0
+# time after which a call that has not responded is flagged as close to the deadline
+DEADLINE_WARNING = 2.5
+# time given to a response sent just before the deadline to reach Discord
+RESPONSE_GRACE = 1.0
+
+# initial response to an interaction, the only one with a deadline
+_CALLBACK_PATH = re.compile(r"/interactions/(\d+)/[^/]+/callback$")
+
+
+@dataclass
+class CommandStats:
+    """Latency and outcome statistics of an application command.
+
+    Autocompletes are done when they respond, so their first response and
+    total times are the same.
+    """
+
+    total: Histogram = field(default_factory=Histogram)
+    first_response: Histogram = field(default_factory=Histogram)
+    outcomes: Counter[str] = field(default_factory=Counter)
+    near_deadline: int = 0
+    missed_deadline: int = 0
+
+    @property
+    def calls(self) -> int:
+        return self.outcomes.total()
+
+
+def _interaction_age(interaction: discord.Interaction) -> float:
+    """Seconds since Discord created the interaction, to compare with the
+    deadline. Latencies are measured with the bot's clock instead.
+    """
+
+    age = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+    # the clocks of Discord and of the bot can differ slightly
+    return max(age, 0.0)
+
 
 class CommandTree(app_commands.CommandTree):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        super().__init__(*args, **kwargs)
+        # (kind, command name) -> stats, kind being one of
+        # "command", "context_menu" or "autocomplete"
+        self.command_stats: dict[tuple[str, str], CommandStats] = {}
+        # interactions that have not responded yet, by ID
+        self._awaiting_response: dict[int, discord.Interaction] = {}
+
+    def get_command_stats(
+        self, name: str, kind: str = "command"
+    ) -> CommandStats | None:
+        """Return the statistics of the command with the given qualified name."""
+
+        return self.command_stats.get((kind, name))
+
+    def trace_responses(self, trace_config: aiohttp.TraceConfig) -> None:
+        """Time the first responses to the interactions with the trace config
+        of the client's HTTP session. The Bot passes it as ``http_trace``.
+        """
+
+        trace_config.on_request_end.append(self._on_request_end)
+
+    async def interaction_check(self, interaction: discord.Interaction, /) -> bool:
+        """Ignore new interactions while the bot is shutting down, and start
+        timing the others.
+
+        The calls are timed from when the bot receives them until they first
+        respond, and until they complete or fail. Calls that have not
+        responded by the deadline are checked without waiting for them.
+        """
+
+        supervisor = getattr(self.client, "supervisor", None)
+        if supervisor is not None:
+            if supervisor.closing:
+                # the bot is shutting down, don't start anything new
+                return False
+            task = asyncio.current_task()
+            if task is not None:
+                supervisor.track(task)
+
+        interaction.extras["received_at"] = time.perf_counter()
+        self._awaiting_response[interaction.id] = interaction
+        asyncio.get_running_loop().call_later(
+            max(
+                INTERACTION_DEADLINE + RESPONSE_GRACE - _interaction_age(interaction),
+                0.0,
+            ),
+            self._check_missed_deadline,
+            interaction,
+        )
+        return True
+
+    async def _on_request_end(
+        self,
+        _: aiohttp.ClientSession,
+        __: SimpleNamespace,
+        params: aiohttp.TraceRequestEndParams,
+    ) -> None:
+        match = _CALLBACK_PATH.search(params.url.path)
+        if match is None or not params.response.ok:
+            return
+
+        interaction = self._awaiting_response.pop(int(match[1]), None)
+        if interaction is not None:
+            self._record_response(interaction)
+
+    def _record_response(self, interaction: discord.Interaction) -> None:
+        kind, name = self._command_key(interaction)
+        stats = self.command_stats.setdefault((kind, name), CommandStats())
+        elapsed = time.perf_counter() - interaction.extras["received_at"]
+        stats.first_response.observe(elapsed)
+        if kind == "autocomplete":
+            # autocompletes have no completion event nor error handler, and
+            # are done once they respond
+            stats.total.observe(elapsed)
+            stats.outcomes["ok"] += 1
+
+        if _interaction_age(interaction) >= DEADLINE_WARNING:
+            stats.near_deadline += 1
+            LOGGER.warning(
+                "%s %s responded close to the %.0fs deadline",
+                kind,
+                name,
+                INTERACTION_DEADLINE,
+            )
+
+    def _check_missed_deadline(self, interaction: discord.Interaction) -> None:
+        if self._awaiting_response.pop(interaction.id, None) is None:
+            return
+
+        # without any response, the interaction failed for the user
+        kind, name = self._command_key(interaction)
+        stats = self.command_stats.setdefault((kind, name), CommandStats())
+        stats.missed_deadline += 1
+        if kind == "autocomplete":
+            stats.outcomes["error"] += 1
+        LOGGER.warning(
+            "%s %s did not respond within the %.0fs deadline",
+            kind,
+            name,
+            INTERACTION_DEADLINE,
+        )
+
+    async def on_app_command_completion(
+        self,
+        interaction: discord.Interaction,
+        _: app_commands.Command | app_commands.ContextMenu,
+    ) -> None:
+        """Record the calls that completed. The Bot adds it as a listener."""
+
+        self._record_call(interaction, "ok")
+
+    @staticmethod
+    def _command_key(interaction: discord.Interaction) -> tuple[str, str]:
+        """Return the kind and qualified name of the interaction's command."""
+
+        if interaction.type is discord.InteractionType.autocomplete:
+            kind = "autocomplete"
+        elif interaction.data is not None and interaction.data.get("type", 1) != 1:
+            kind = "context_menu"
+        else:
+            kind = "command"
+
+        command = interaction.command
+        name = (
+            command.qualified_name
+            if command is not None
+            else interaction.data.get("name", "unknown")  # type: ignore[reportOptionalMemberAccess]
+        )
+        return kind, name
+
+    def _record_call(self, interaction: discord.Interaction, outcome: str) -> None:
+        stats = self.command_stats.setdefault(
+            self._command_key(interaction), CommandStats()
+        )
+        received_at = interaction.extras.get("received_at")
+        if received_at is not None:
+            stats.total.observe(time.perf_counter() - received_at)
+        stats.outcomes[outcome] += 1
+
     async def on_error(
         self, interaction: discord.Interaction, error: app_commands.AppCommandError
     ) -> None:
@@ -27,6 +222,13 @@ class CommandTree(app_commands.CommandTree):
                 interaction.extras["error_handled"] = False
         ```
         """
+        self._record_call(
+            interaction,
+            "cooldown"
+            if isinstance(error, app_commands.CommandOnCooldown)
+            else "error",
+        )
+
         command = interaction.command
         # assume the error is handled by default, unless explicitely set to False
         error_handled = interaction.extras.get("error_handled", True)
@@ -41,7 +243,8 @@ class CommandTree(app_commands.CommandTree):
                 await self._on_cooldown(interaction, error)
             else:
                 LOGGER.error(
-                    f"Ignoring exception in command ({interaction.data['name']})",  # type: ignore[not-none]
+                    "Ignoring exception in command (%s)",
+                    interaction.data["name"],  # type: ignore[not-none]
                     exc_info=error,
                 )
         else:
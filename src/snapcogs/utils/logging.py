@@ -1,17 +1,69 @@
+from __future__ import annotations
+
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import TYPE_CHECKING
 
 import discord
 
+if TYPE_CHECKING:
+    from pathlib import Path
+
+LOG_FORMAT = "%(asctime)s : %(levelname)s : %(name)s : %(message)s"
+
+# logger name -> handler and listener added by get_logger
+_QUEUES: dict[str | None, tuple[QueueHandler, QueueListener]] = {}
+
+
+def get_logger(
+    name: str | None = None,
+    *,
+    log_file: str | Path | None = None,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+) -> logging.Logger:
+    """Return the logger, with its records written in a background thread.
+
+    The logger only puts its records in a queue, and a listener thread writes
+    them to stderr, and to a rotating log file if one is given. Calling this
+    again for the same logger stops the previous listener and closes its
+    handlers before replacing them.
+    """
 
-def get_logger(name: str | None = None) -> logging.Logger:
     logger = logging.getLogger(name)
-    log_handler = logging.StreamHandler()
-    if discord.utils.stream_supports_colour(log_handler.stream):
-        log_format = discord.utils._ColourFormatter()
+
+    stream_handler = logging.StreamHandler()
+    if discord.utils.stream_supports_colour(stream_handler.stream):
+        stream_handler.setFormatter(discord.utils._ColourFormatter())
     else:
-        log_format = logging.Formatter(
-            "%(asctime)s : %(levelname)s : %(name)s : %(message)s"
+        stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    handlers: list[logging.Handler] = [stream_handler]
+
+    if log_file is not None:
+        file_handler = RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
         )
-    log_handler.setFormatter(log_format)
-    logger.addHandler(log_handler)
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handlers.append(file_handler)
+
+    if name in _QUEUES:
+        old_handler, old_listener = _QUEUES.pop(name)
+        logger.removeHandler(old_handler)
+        old_listener.stop()
+        atexit.unregister(old_listener.stop)
+        # release the log file before a new handler opens it
+        for handler in old_listener.handlers:
+            handler.close()
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    logger.addHandler(queue_handler)
+    _QUEUES[name] = (queue_handler, listener)
+
     return logger
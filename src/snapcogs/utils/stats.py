@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import bisect
+import math
+from dataclasses import dataclass, field
+
+# upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.0,
+    2.5,
+    3.0,
+    5.0,
+    10.0,
+    math.inf,
+)
+
+
+@dataclass
+class Histogram:
+    """Count of observed values per bucket, with their sum and maximum.
+
+    The buckets are given by their upper bound, and the last one must be
+    infinite so that every value falls in a bucket.
+    """
+
+    bounds: tuple[float, ...] = LATENCY_BUCKETS
+    counts: list[int] = field(init=False)
+    count: int = 0
+    sum: float = 0.0
+    max: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.counts = [0] * len(self.bounds)
+
+    @property
+    def average(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile, interpolating inside its bucket."""
+
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(self.bounds, self.counts, strict=True):
+            if count and seen + count >= rank:
+                upper = min(bound, self.max)
+                return lower + (upper - lower) * (rank - seen) / count
+
+            seen += count
+            lower = bound
+
+        return self.max
+
+    def cumulative_counts(self) -> list[tuple[float, int]]:
+        """Return the number of values below each bucket's upper bound."""
+
+        cumulative = []
+        total = 0
+        for bound, count in zip(self.bounds, self.counts, strict=True):
+            total += count
+            cumulative.append((bound, total))
+
+        return cumulative
@@ -1,6 +1,13 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import discord
 from discord import ui
 
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
 
 # confirm view
 class Confirm(ui.View):
@@ -45,3 +52,81 @@ async def confirm_prompt(
     await confirm.wait()
 
     return confirm
+
+
+# paginator view
+class Paginator(ui.View):
+    """View to browse pages of embeds, which are built when they are shown."""
+
+    def __init__(
+        self,
+        get_page: Callable[[int], Awaitable[discord.Embed]],
+        page_count: int,
+        *,
+        author: discord.abc.User,
+    ) -> None:
+        super().__init__()
+        self.get_page = get_page
+        self.page_count = page_count
+        self.author = author
+        self.index = 0
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Only the command author can use the View."""
+
+        return interaction.user == self.author
+
+    async def build_page(self) -> discord.Embed:
+        """Build the current page and update the buttons."""
+
+        self.on_previous.disabled = self.index == 0
+        self.on_next.disabled = self.index == self.page_count - 1
+
+        embed = await self.get_page(self.index)
+        return embed.set_footer(text=f"Page {self.index + 1}/{self.page_count}")
+
+    @ui.button(
+        style=discord.ButtonStyle.gray,
+        emoji="\N{BLACK LEFT-POINTING TRIANGLE}",
+    )
+    async def on_previous(self, interaction: discord.Interaction, _: ui.Button) -> None:
+        self.index -= 1
+        await self.show_page(interaction)
+
+    @ui.button(
+        style=discord.ButtonStyle.gray,
+        emoji="\N{BLACK RIGHT-POINTING TRIANGLE}",
+    )
+    async def on_next(self, interaction: discord.Interaction, _: ui.Button) -> None:
+        self.index += 1
+        await self.show_page(interaction)
+
+    async def show_page(self, interaction: discord.Interaction) -> None:
+        """Acknowledge the button press, then build the page and show it."""
+
+        await interaction.response.defer()
+        await interaction.edit_original_response(
+            embed=await self.build_page(), view=self
+        )
+
+
+# paginated embeds
+async def paginate(
+    interaction: discord.Interaction,
+    get_page: Callable[[int], Awaitable[discord.Embed]],
+    page_count: int,
+) -> Paginator:
+    """Send the first page with buttons for the user to browse the other pages.
+    The pages are built by get_page(index) when they are shown, after the
+    interaction is deferred since building them can take a while.
+    """
+
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    paginator = Paginator(get_page, page_count, author=interaction.user)
+    embed = await paginator.build_page()
+    if page_count > 1:
+        await interaction.followup.send(embed=embed, view=paginator, ephemeral=True)
+    else:
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    return paginator